@@ -0,0 +1,35 @@
+"""Create the polls_votes table
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '014'
+down_revision: Union[str, None] = '013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Databases started before this migration already have the table from the ORM
+    # metadata (Database.init_db), so only create it when it is missing
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS polls_votes (
+            id BIGSERIAL PRIMARY KEY,
+            poll_id BIGINT NOT NULL REFERENCES polls_polls(id) ON DELETE CASCADE,
+            user_id VARCHAR NOT NULL,
+            option_ids JSON NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT unique_user_poll_vote UNIQUE (poll_id, user_id)
+        )
+    """)
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS polls_votes")
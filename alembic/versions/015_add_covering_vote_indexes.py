@@ -0,0 +1,39 @@
+"""Add covering indexes for vote lookups by poll
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '015'
+down_revision: Union[str, None] = '014'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Scoring reads only user_id and the selected options for a poll, so carrying
+# them in the index lets Postgres answer WHERE poll_id = ? with an index-only scan
+COVERING_INDEXES = [
+    ('idx_votes_poll_id_covering', 'polls_votes', 'option_ids'),
+    ('idx_user_poll_selections_poll_id_covering', 'polls_user_poll_selections', 'selections'),
+]
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for index_name, table_name, options_column in COVERING_INDEXES:
+            op.execute(f"""
+                CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name}
+                ON {table_name} (poll_id) INCLUDE (user_id, {options_column})
+            """)
+            op.execute(f"ANALYZE {table_name}")
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, _, _ in COVERING_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
@@ -0,0 +1,45 @@
+"""Normalize stored option lists to JSON arrays of strings
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '016'
+down_revision: Union[str, None] = '015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# New writes go through the ORM validators, which store option ids as strings;
+# rewrite older rows that were saved as numbers so every row has the same shape
+OPTION_LIST_COLUMNS = [
+    ('polls_polls', 'correct_answers'),
+    ('polls_votes', 'option_ids'),
+    ('polls_user_poll_selections', 'selections'),
+]
+
+def upgrade() -> None:
+    for table_name, column_name in OPTION_LIST_COLUMNS:
+        op.execute(f"""
+            UPDATE {table_name}
+            SET {column_name} = (
+                SELECT json_agg(elem)
+                FROM json_array_elements_text({column_name}) AS elem
+            )
+            WHERE json_typeof({column_name}) = 'array'
+              AND EXISTS (
+                  SELECT 1
+                  FROM json_array_elements({column_name}) AS elem
+                  WHERE json_typeof(elem) <> 'string'
+              )
+        """)
+
+def downgrade() -> None:
+    # String ids are read correctly by all versions of the code
+    pass
@@ -0,0 +1,33 @@
+"""Add covering indexes for leaderboard reads
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '017'
+down_revision: Union[str, None] = '016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # Top-N reads filter on (guild_id, poll_type) and order by rank; carrying the
+        # returned columns lets Postgres serve them with an index-only scan
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_leaderboard_guild_type_rank
+            ON polls_poll_type_leaderboards (guild_id, poll_type, rank)
+            INCLUDE (user_id, points, total_correct)
+        """)
+        op.execute("ANALYZE polls_poll_type_leaderboards")
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_leaderboard_guild_type_rank")
@@ -0,0 +1,37 @@
+"""Add unique constraint on user poll selections
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '018'
+down_revision: Union[str, None] = '017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Keep only the most recent selection row per user and poll before adding the constraint
+    op.execute("""
+        DELETE FROM polls_user_poll_selections s
+        USING polls_user_poll_selections newer
+        WHERE newer.poll_id = s.poll_id
+          AND newer.user_id = s.user_id
+          AND newer.id > s.id
+    """)
+
+    # add_selection upserts on (poll_id, user_id)
+    op.create_unique_constraint(
+        'unique_user_poll_selection',
+        'polls_user_poll_selections',
+        ['poll_id', 'user_id']
+    )
+
+def downgrade() -> None:
+    op.drop_constraint('unique_user_poll_selection', 'polls_user_poll_selections', type_='unique')
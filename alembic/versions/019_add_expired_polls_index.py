@@ -0,0 +1,34 @@
+"""Add partial index for the expired poll sweep
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '019'
+down_revision: Union[str, None] = '018'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # PollService.get_expired_polls filters on exactly this predicate; only open
+        # polls are indexed, so the sweep stays cheap as revealed polls accumulate
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_polls_expired
+            ON polls_polls (end_time)
+            INCLUDE (guild_id, poll_type)
+            WHERE is_active = true AND is_revealed = false
+        """)
+        op.execute("ANALYZE polls_polls")
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_polls_expired")
@@ -0,0 +1,34 @@
+"""Add partial covering index for active poll lookups
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '020'
+down_revision: Union[str, None] = '019'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # The active poll sweeps read only these columns, so with the remaining ones
+        # carried in the index they become index-only scans over the open polls
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS polls_active_idx
+            ON polls_polls (guild_id, poll_type)
+            INCLUDE (id, end_time, channel_id)
+            WHERE is_active = true
+        """)
+        op.execute("ANALYZE polls_polls")
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS polls_active_idx")
@@ -0,0 +1,38 @@
+"""Add unique constraint on poll messages
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '021'
+down_revision: Union[str, None] = '020'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # Keep only the most recent row per registered message before adding the constraint
+    op.execute("""
+        DELETE FROM polls_poll_messages m
+        USING polls_poll_messages newer
+        WHERE newer.poll_id = m.poll_id
+          AND newer.channel_id = m.channel_id
+          AND newer.message_id = m.message_id
+          AND newer.id > m.id
+    """)
+
+    # register_poll_message inserts with ON CONFLICT DO NOTHING on these columns
+    op.create_unique_constraint(
+        'unique_poll_message',
+        'polls_poll_messages',
+        ['poll_id', 'channel_id', 'message_id']
+    )
+
+def downgrade() -> None:
+    op.drop_constraint('unique_poll_message', 'polls_poll_messages', type_='unique')
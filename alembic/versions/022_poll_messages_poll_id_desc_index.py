@@ -0,0 +1,37 @@
+"""Index poll messages by poll, newest first
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '022'
+down_revision: Union[str, None] = '021'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        # get_poll_messages pages through a poll's messages newest first; this index
+        # serves ORDER BY id DESC LIMIT n directly and covers every poll_id lookup
+        # the single-column index did
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_poll_messages_poll_id_id
+            ON polls_poll_messages (poll_id, id DESC)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_poll_messages_poll_id")
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_poll_messages_poll_id
+            ON polls_poll_messages (poll_id)
+        """)
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_poll_messages_poll_id_id")
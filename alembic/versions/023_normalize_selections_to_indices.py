@@ -0,0 +1,78 @@
+"""Store poll selections as option indices only
+
+Revision ID: 023
+Revises: 022
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '023'
+down_revision: Union[str, None] = '022'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Poll buttons used to store the option text; everything else (votes, correct
+# answers, the vote command) stores the option index
+OPTION_LIST_COLUMNS = [
+    ('polls_user_poll_selections', 'selections'),
+    ('polls_votes', 'option_ids'),
+]
+
+def upgrade() -> None:
+    for table_name, column_name in OPTION_LIST_COLUMNS:
+        # A value that is already a valid index of the poll is kept as is, so an
+        # option text such as "1" that is also an index reads as that index.
+        # Otherwise a matching option text becomes its index. Values matching
+        # neither are left alone, and duplicates created by the mapping keep
+        # their first position.
+        op.execute(f"""
+            WITH mapped AS (
+                SELECT t.id, e.ord, COALESCE(by_index.value, by_text.value, e.value) AS value
+                FROM {table_name} t
+                CROSS JOIN LATERAL json_array_elements_text(t.{column_name})
+                    WITH ORDINALITY AS e(value, ord)
+                LEFT JOIN LATERAL (
+                    SELECT o.index::text AS value
+                    FROM polls_poll_options o
+                    WHERE o.poll_id = t.poll_id AND o.index::text = e.value
+                    LIMIT 1
+                ) by_index ON true
+                LEFT JOIN LATERAL (
+                    SELECT o.index::text AS value
+                    FROM polls_poll_options o
+                    WHERE o.poll_id = t.poll_id AND o.text = e.value
+                    ORDER BY o.index
+                    LIMIT 1
+                ) by_text ON true
+                WHERE json_typeof(t.{column_name}) = 'array'
+            ),
+            deduped AS (
+                SELECT id, value, MIN(ord) AS ord
+                FROM mapped
+                GROUP BY id, value
+            ),
+            normalized AS (
+                SELECT id, json_agg(value ORDER BY ord) AS options
+                FROM deduped
+                GROUP BY id
+            )
+            UPDATE {table_name} t
+            SET {column_name} = n.options
+            FROM normalized n
+            WHERE t.id = n.id
+              AND t.{column_name}::jsonb IS DISTINCT FROM n.options::jsonb
+        """)
+
+def downgrade() -> None:
+    # The text a selection was stored under can't be recovered: option texts may
+    # repeat or look like indices, and votes were rewritten alongside selections.
+    # Older code matching on option text would silently score indices as wrong.
+    raise NotImplementedError(
+        "023 rewrote stored option texts to indices and cannot be downgraded; "
+        "restore a backup taken before upgrading instead"
+    )
@@ -2,7 +2,6 @@ import asyncio
 import argparse
 import logging
 import os
-from logging.handlers import RotatingFileHandler
 import json
 from pathlib import Path
 import re
@@ -16,6 +15,7 @@ from src.config.settings import Settings, PollConfig
 from src.database.database import Database, initialize_database
 from src.services.guild_service import GuildService
 from src.services.poll_service import PollService
+from src.utils.logging_config import setup_logging
 
 # Function to reset commands for all guilds in the database
 async def reset_commands_for_all_guilds(token, application_id):
@@ -120,20 +120,6 @@ def parse_args():
     )
     return parser.parse_args()
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        RotatingFileHandler(
-            'discord_bot.log',
-            maxBytes=10000000,
-            backupCount=5
-        ),
-        logging.StreamHandler()
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
 class PollBot(commands.Bot):
@@ -381,6 +367,7 @@ class PollBot(commands.Bot):
                 logger.warning(f"  No poll configurations found for this guild")
 
 async def main():
+    setup_logging()
     args = parse_args()
     
     # Parse the comma-separated list of config files
@@ -8,6 +8,7 @@ import asyncio
 from src.database.database import get_session
 from src.services.points_service import PointsService
 from src.utils.exceptions import PointsError
+from src.utils.constants import EMOJI_LETTERS
 
 logger = logging.getLogger(__name__)
 
@@ -199,9 +200,6 @@ class DashboardCommands(commands.Cog):
                     
                     active_poll_info = f"**Current Poll: {active_poll.question}**\n"
                     
-                    # Define emoji letters (A-Z)
-                    emoji_letters = [chr(ord('🇦') + i) for i in range(26)]
-                    
                     if user_vote:
                         # User has voted in Vote table
                         selected_options = []
@@ -210,7 +208,7 @@ class DashboardCommands(commands.Cog):
                             try:
                                 idx_int = int(idx)
                                 if idx_int in options:
-                                    letter = emoji_letters[idx_int] if idx_int < 26 else f"#{idx_int+1}"
+                                    letter = EMOJI_LETTERS[idx_int] if idx_int < 26 else f"#{idx_int+1}"
                                     selected_options.append(f"{letter} {options[idx_int]}")
                             except (ValueError, TypeError):
                                 continue
@@ -227,7 +225,7 @@ class DashboardCommands(commands.Cog):
                             try:
                                 idx_int = int(idx)
                                 if idx_int in options:
-                                    letter = emoji_letters[idx_int] if idx_int < 26 else f"#{idx_int+1}"
+                                    letter = EMOJI_LETTERS[idx_int] if idx_int < 26 else f"#{idx_int+1}"
                                     selected_options.append(f"{letter} {options[idx_int]}")
                             except (ValueError, TypeError):
                                 continue
@@ -281,9 +279,6 @@ class DashboardCommands(commands.Cog):
                     
                     last_poll_info = f"**Last Poll: {last_poll.question}**\n"
                     
-                    # Define emoji letters (A-Z)
-                    emoji_letters = [chr(ord('🇦') + i) for i in range(26)]
-                    
                     # If poll is revealed, show correct answers
                     if last_poll.is_revealed:
                         # Get and format correct answers
@@ -294,7 +289,7 @@ class DashboardCommands(commands.Cog):
                                 try:
                                     idx_int = int(idx) if isinstance(idx, str) else idx
                                     if idx_int in options:
-                                        letter = emoji_letters[idx_int] if idx_int < 26 else f"#{idx_int+1}"
+                                        letter = EMOJI_LETTERS[idx_int] if idx_int < 26 else f"#{idx_int+1}"
                                         correct_options.append(f"{letter} {options[idx_int]}")
                                 except (ValueError, TypeError):
                                     continue
@@ -325,7 +320,7 @@ class DashboardCommands(commands.Cog):
                                 try:
                                     idx_int = int(idx) if isinstance(idx, str) else idx
                                     if idx_int in options:
-                                        letter = emoji_letters[idx_int] if idx_int < 26 else f"#{idx_int+1}"
+                                        letter = EMOJI_LETTERS[idx_int] if idx_int < 26 else f"#{idx_int+1}"
                                         selected_options.append(f"{letter} {options[idx_int]}")
                                 except (ValueError, TypeError):
                                     continue
@@ -365,7 +360,7 @@ class DashboardCommands(commands.Cog):
                                 try:
                                     idx_int = int(idx) if isinstance(idx, str) else idx
                                     if idx_int in options:
-                                        letter = emoji_letters[idx_int] if idx_int < 26 else f"#{idx_int+1}"
+                                        letter = EMOJI_LETTERS[idx_int] if idx_int < 26 else f"#{idx_int+1}"
                                         selected_options.append(f"{letter} {options[idx_int]}")
                                 except (ValueError, TypeError):
                                     continue
@@ -1,4 +1,5 @@
 from typing import List, Optional, Dict
+from collections import Counter
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
@@ -6,23 +7,31 @@ import asyncio
 from datetime import datetime, timedelta, timezone
 import logging
 from sqlalchemy import select
+from sqlalchemy.engine import Row
 
 from src.config.settings import settings
 from src.database.database import get_session
 from src.services.poll_service import PollService
 from src.services.points_service import PointsService
-from src.utils.constants import Messages, CommandNames, PollType
+from src.utils.constants import Messages, CommandNames, PollType, EMOJI_LETTERS
 from src.bot.views.poll_view import PollView, PollAdminView
 from src.database.models import Poll, PollStatus, PollOption
 from src.utils.exceptions import PollError
 
 logger = logging.getLogger(__name__)
 
+# Expired polls closed concurrently per batch by _check_expired_polls
+EXPIRED_POLL_CLOSE_BATCH_SIZE = 8
+
 class PollCommands(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.logger = logging.getLogger(__name__)
         self.poll_update_tasks = {}
+        # Leaderboard rebuilds run off the read path, one (guild_id, poll_type) at a time
+        self.leaderboard_rebuild_queue = asyncio.Queue()
+        self._queued_rebuilds = set()
+        self._rebuild_worker = None
         self._update_active_polls.start()  # Start the background task
         self._check_expired_polls.start()  # Start the task that checks for expired polls
 
@@ -38,10 +47,23 @@ class PollCommands(commands.Cog):
             self._check_expired_polls.start()
             self.logger.info("Started _check_expired_polls task")
         
+        # Kept so cog_unload can stop it; a reload would otherwise add a second worker
+        if self._rebuild_worker is None or self._rebuild_worker.done():
+            self._rebuild_worker = self.bot.loop.create_task(self._process_leaderboard_rebuilds())
+        
         # Continue with delayed command registration to avoid blocking startup
         self.bot.loop.create_task(self._register_commands_delayed())
         self.logger.info("Scheduled command registration to run in background")
     
+    def cog_unload(self):
+        """Called when the cog is unloaded. Stop the background tasks."""
+        self._update_active_polls.cancel()
+        self._check_expired_polls.cancel()
+        if self._rebuild_worker is not None:
+            self._rebuild_worker.cancel()
+            self._rebuild_worker = None
+        self.logger.info("Stopped PollCommands background tasks")
+    
     async def _register_commands_delayed(self):
         """Register commands with a delay to avoid blocking bot startup."""
         try:
@@ -83,13 +105,15 @@ class PollCommands(commands.Cog):
                             close_poll_cmd = self._close_poll_command(poll_type)
                             reveal_poll_cmd = self._reveal_poll_command(poll_type)
                             vote_cmd = self._vote_command(poll_type)
+                            rebuild_cmd = self._rebuild_leaderboard_command(poll_type)
                             
                             # Track command names being registered
                             poll_commands = [
                                 f"create_{poll_type}",
                                 f"close_{poll_type}",
                                 f"reveal_{poll_type}",
-                                f"vote_{poll_type}"
+                                f"vote_{poll_type}",
+                                f"rebuild_{poll_type}"
                             ]
                             registered_commands.extend(poll_commands)
                             
@@ -98,6 +122,7 @@ class PollCommands(commands.Cog):
                             self.bot.tree.add_command(close_poll_cmd, guild=guild)
                             self.bot.tree.add_command(reveal_poll_cmd, guild=guild)
                             self.bot.tree.add_command(vote_cmd, guild=guild)
+                            self.bot.tree.add_command(rebuild_cmd, guild=guild)
                             commands_registered = True
                         except Exception as cmd_error:
                             self.logger.error(f"Error registering commands for poll type {poll_type}: {cmd_error}", exc_info=True)
@@ -296,7 +321,7 @@ class PollCommands(commands.Cog):
                     content += f"Select up to {max_selections} option(s).\n\n"
                 
                 # Add options with emoji letters (A-Z)
-                emoji_letters = [chr(ord('🇦') + i) for i in range(min(26, len(option_list)))]
+                emoji_letters = EMOJI_LETTERS[:len(option_list)]
                 for i, option in enumerate(option_list):
                     if i < len(emoji_letters):
                         content += f"{emoji_letters[i]} {option}\n"
@@ -383,6 +408,51 @@ class PollCommands(commands.Cog):
             
         return vote
         
+    def _rebuild_leaderboard_command(self, poll_type):
+        """Create a leaderboard rebuild command with the poll_type properly bound."""
+        @app_commands.command(
+            name=f"rebuild_{poll_type}",
+            description=f"Rebuild the {poll_type} leaderboard from all revealed polls"
+        )
+        @app_commands.guild_only()
+        @app_commands.default_permissions(administrator=True)
+        async def rebuild_leaderboard(interaction: discord.Interaction):
+            # The poll_type is properly bound from the outer function
+            self.queue_leaderboard_rebuild(interaction.guild_id, poll_type)
+            await interaction.response.send_message(
+                f"The {poll_type} leaderboard rebuild has been queued.",
+                ephemeral=True
+            )
+            
+        return rebuild_leaderboard
+        
+    def queue_leaderboard_rebuild(self, guild_id: int, poll_type: str) -> None:
+        """Schedule a full leaderboard rebuild unless one is already pending."""
+        key = (guild_id, poll_type)
+        if key in self._queued_rebuilds:
+            return
+        self._queued_rebuilds.add(key)
+        self.leaderboard_rebuild_queue.put_nowait(key)
+        self.logger.info(f"Queued leaderboard rebuild for guild {guild_id}, poll type {poll_type}")
+        
+    async def _process_leaderboard_rebuilds(self):
+        """Background worker that rebuilds queued leaderboards one at a time."""
+        while True:
+            guild_id, poll_type = await self.leaderboard_rebuild_queue.get()
+            # Allow the same leaderboard to be queued again while this rebuild runs
+            self._queued_rebuilds.discard((guild_id, poll_type))
+            try:
+                async with self.bot.db() as session:
+                    points_service = PointsService(session)
+                    await points_service.update_guild_leaderboard(guild_id, poll_type)
+                    await session.commit()
+                    points_service.invalidate_cached_leaderboard(guild_id, poll_type)
+                self.logger.info(f"Rebuilt leaderboard for guild {guild_id}, poll type {poll_type}")
+            except Exception as e:
+                self.logger.error(f"Error rebuilding leaderboard for guild {guild_id}, poll type {poll_type}: {e}", exc_info=True)
+            finally:
+                self.leaderboard_rebuild_queue.task_done()
+        
     async def _handle_vote(self, interaction: discord.Interaction, poll_type: str):
         """
         Vote on an active poll.
@@ -421,10 +491,11 @@ class PollCommands(commands.Cog):
                 if user_selections:
                     for selection in user_selections:
                         if 'selections' in selection and selection['selections']:
-                            if isinstance(selection['selections'], list):
-                                selected_indices.extend(selection['selections'])
-                            else:
-                                selected_indices.append(selection['selections'])
+                            stored = selection['selections']
+                            if not isinstance(stored, list):
+                                stored = [stored]
+                            # Indices are stored as strings; the voting buttons compare ints
+                            selected_indices.extend(int(idx) for idx in stored if str(idx).isdigit())
                 
                 # Create a new ephemeral message with fresh components
                 await self._send_voting_interface(interaction, poll, selected_indices)
@@ -467,7 +538,7 @@ class PollCommands(commands.Cog):
         current_selections = selected_indices.copy()
         
         # Define emoji letters A through Z for options
-        emoji_letters = [chr(ord('🇦') + i) for i in range(min(26, len(options_list)))]
+        emoji_letters = EMOJI_LETTERS[:len(options_list)]
         
         for i, option_text in enumerate(options_list):
             row = i // option_buttons_per_row
@@ -842,7 +913,7 @@ class PollCommands(commands.Cog):
                 current_selections.sort()
                 
                 # Update the poll info with current selections
-                emoji_letters = [chr(ord('🇦') + i) for i in range(min(26, len(options_list)))]
+                emoji_letters = EMOJI_LETTERS[:len(options_list)]
                 poll_info = f"**Poll: {poll.question}**\n\nSelect the correct answer(s):\nMax selections allowed in this poll: {poll.max_selections}"
                 
                 if current_selections:
@@ -904,8 +975,8 @@ class PollCommands(commands.Cog):
                     
                     try:
                         # 1. Update the poll to mark correct answers
+                        # Everything below runs in one transaction that is committed once at the end
                         updated_poll = await poll_service.reveal_poll(poll.id, correct_indices)
-                        await session.commit()  # Commit the poll update
                         self.logger.info(f"Successfully marked correct answers for poll {poll.id}")
                         
                         # 2. Calculate points based on the revealed answers
@@ -916,34 +987,24 @@ class PollCommands(commands.Cog):
                         else:
                             self.logger.info(f"Calculated points for {len(points_updates)} users")
                         
-                        # 3. Get the updated leaderboard
+                        # Commit the reveal and the points added to the leaderboard together
+                        await session.commit()
+                        # Readers in other sessions may have cached the standings from before this commit
+                        points_service.invalidate_cached_leaderboard(interaction.guild_id, poll.poll_type)
+                        
+                        # 3. Read the updated leaderboard
                         leaderboard = await points_service.get_poll_type_leaderboard(
                             guild_id=interaction.guild_id,
                             poll_type=poll.poll_type,
                             limit=10
                         )
                         
-                        if not leaderboard:
-                            self.logger.warning("Leaderboard is empty after updating points, attempting to force refresh")
-                            # Force a refresh and try again
-                            await points_service.update_poll_type_leaderboard(
-                                guild_id=interaction.guild_id,
-                                poll_type=poll.poll_type,
-                                user_points={}  # Empty dict to trigger a full refresh
-                            )
-                            await session.commit()
-                            
-                            # Fetch again after refresh
-                            leaderboard = await points_service.get_poll_type_leaderboard(
-                                guild_id=interaction.guild_id,
-                                poll_type=poll.poll_type,
-                                limit=10
-                            )
-                            
                         if leaderboard:
                             self.logger.info(f"Successfully fetched leaderboard with {len(leaderboard)} entries")
                         else:
-                            self.logger.warning("Leaderboard still empty after refresh")
+                            # Don't rebuild on this request; let the background worker do it
+                            self.logger.warning("Leaderboard is empty after the reveal, queueing a rebuild")
+                            self.queue_leaderboard_rebuild(interaction.guild_id, poll.poll_type)
                             leaderboard = []
 
                         # 4. Load poll options explicitly to avoid lazy loading in _format_results_message_with_dict
@@ -1003,7 +1064,7 @@ class PollCommands(commands.Cog):
         poll_info = f"**Poll: {poll.question}**\n\nSelect the correct answer(s):\nMax selections allowed in this poll: {poll.max_selections}"
         
         # Add options list with their emojis for reference (outside of buttons)
-        emoji_letters = [chr(ord('🇦') + i) for i in range(min(26, len(options_list)))]
+        emoji_letters = EMOJI_LETTERS[:len(options_list)]
         poll_info += "\n\nOptions:"
         for i, option_text in enumerate(options_list):
             label = emoji_letters[i] if i < len(emoji_letters) else f"{i+1}"
@@ -1055,7 +1116,7 @@ class PollCommands(commands.Cog):
             correct_indices = poll.correct_answers
 
             # Use emoji letters for display
-            emoji_letters = [chr(ord('🇦') + i) for i in range(26)]  # A-Z emojis
+            emoji_letters = EMOJI_LETTERS  # A-Z emojis
 
             for i, index in enumerate(correct_indices):
                 index_str = str(index)
@@ -1078,13 +1139,7 @@ class PollCommands(commands.Cog):
         message += f"Total participants: {participants}\n\n"
         
         # Group participants by points
-        points_distribution = {}
-        for update in points_updates:
-            points = update.get('poll_points', 0)
-            if points in points_distribution:
-                points_distribution[points] += 1
-            else:
-                points_distribution[points] = 1
+        points_distribution = Counter(update.get('poll_points', 0) for update in points_updates)
         
         # Format points distribution
         message += "Points distribution:\n"
@@ -1169,7 +1224,7 @@ class PollCommands(commands.Cog):
             correct_answers_text = []
 
             # Use emoji letters for display
-            emoji_letters = [chr(ord('🇦') + i) for i in range(26)]  # A-Z emojis
+            emoji_letters = EMOJI_LETTERS  # A-Z emojis
 
             for index in correct_indices:
                 index_str = str(index)
@@ -1192,13 +1247,7 @@ class PollCommands(commands.Cog):
         message += f"Total participants: {participants}\n\n"
         
         # Group participants by points
-        points_distribution = {}
-        for update in points_updates:
-            points = update.get('poll_points', 0)
-            if points in points_distribution:
-                points_distribution[points] += 1
-            else:
-                points_distribution[points] = 1
+        points_distribution = Counter(update.get('poll_points', 0) for update in points_updates)
         
         # Format points distribution
         message += "Points distribution:\n"
@@ -1293,7 +1342,7 @@ class PollCommands(commands.Cog):
                     now = datetime.now(timezone.utc)
                     
                     # TZDateTime ensures poll.end_time is already timezone-aware
-                    if poll.end_time <= now and poll.is_active:
+                    if poll.end_time <= now:
                         self.logger.info(f"Poll {poll.id} has expired, marking as closed")
                         async with self.bot.db() as session:
                             poll_service = PollService(session)
@@ -1346,65 +1395,43 @@ class PollCommands(commands.Cog):
         try:
             self.logger.info("Checking for expired polls...")
             
-            # First, get all active polls
-            active_polls = []
+            # Only the ids are needed to close the polls, so fetch plain rows
             try:
                 async with self.bot.db() as session:
                     poll_service = PollService(session)
-                    active_polls = await poll_service.get_all_active_polls()
-                self.logger.info(f"Found {len(active_polls)} active polls to check for expiration")
+                    expired_polls = await poll_service.get_expired_polls()
+                self.logger.info(f"Found {len(expired_polls)} expired polls to close")
             except Exception as e:
-                self.logger.error(f"Error retrieving active polls: {e}", exc_info=True)
+                self.logger.error(f"Error retrieving expired polls: {e}", exc_info=True)
                 return
             
-            # Get current time with timezone information
-            now = datetime.now(timezone.utc)
-            self.logger.info(f"Current time (UTC): {now}")
+            for poll in expired_polls:
+                self.logger.info(f"Poll {poll.id} (type: {poll.poll_type}, end_time: {poll.end_time}) has expired, marking as closed")
             
-            # Process each poll in its own session to isolate transactions
-            for poll in active_polls:
-                poll_info = f"Poll #{poll.id} (type: {poll.poll_type}, end_time: {poll.end_time}, is_active: {poll.is_active})"
-                
-                if poll.end_time is None:
-                    self.logger.info(f"{poll_info} - No end time set, skipping expiration check")
-                    continue
-                
-                # Make sure the poll end time is timezone aware
-                if hasattr(poll.end_time, 'tzinfo') and poll.end_time.tzinfo is None:
-                    # If end_time doesn't have timezone info, assume UTC
-                    poll.end_time = poll.end_time.replace(tzinfo=timezone.utc)
-                
-                # Check if poll has expired
-                if poll.end_time <= now:
-                    self.logger.info(f"Poll {poll.id} has expired, marking as closed")
-                    
-                    try:
-                        async with self.bot.db() as session:
-                            poll_service = PollService(session)
-                            await poll_service.close_poll(poll.id)
-                            await session.commit()
-                        self.logger.info(f"Successfully closed expired poll {poll.id}")
-                    except Exception as e:
-                        self.logger.error(f"Error closing expired poll {poll.id}: {e}", exc_info=True)
-                else:
-                    remaining = poll.end_time - now
-                    self.logger.debug(f"{poll_info} - Not expired yet. Remaining time: {remaining}")
+            # Each close uses its own session, so a batch can run concurrently; batches
+            # stay small enough to leave pool connections for interactive commands
+            for start in range(0, len(expired_polls), EXPIRED_POLL_CLOSE_BATCH_SIZE):
+                batch = expired_polls[start:start + EXPIRED_POLL_CLOSE_BATCH_SIZE]
+                await asyncio.gather(*(self._close_expired_poll(poll) for poll in batch))
         except Exception as e:
             self.logger.error(f"Error in _check_expired_polls task: {e}", exc_info=True)
+    
+    async def _close_expired_poll(self, poll: Row):
+        """Close one expired poll in its own session to isolate its transaction."""
+        try:
+            async with self.bot.db() as session:
+                poll_service = PollService(session)
+                await poll_service.close_poll(poll.id)
+                await session.commit()
+            self.logger.info(f"Successfully closed expired poll {poll.id}")
+        except Exception as e:
+            self.logger.error(f"Error closing expired poll {poll.id}: {e}", exc_info=True)
             
     @_check_expired_polls.before_loop
     async def before_check_expired_polls(self):
         """Wait until the bot is ready before starting the task."""
         await self.bot.wait_until_ready()
 
-    def _ensure_timezone_aware(self, dt):
-        """Ensure a datetime object has timezone information (UTC)."""
-        if dt is None:
-            return None
-        if dt.tzinfo is None:
-            return dt.replace(tzinfo=timezone.utc)
-        return dt
-
 async def setup(bot: commands.Bot):
     """Setup function for the poll commands cog."""
     await bot.add_cog(PollCommands(bot))
\ No newline at end of file
@@ -10,6 +10,7 @@ from sqlalchemy import select, and_, desc
 from src.database.models import Poll, PollStatus, PollMessage, UIState
 from src.services.poll_service import PollService
 from src.services.points_service import PointsService
+from src.services.loaders import PollMessageLoader
 from src.utils.exceptions import PollError
 from src.utils.constants import ButtonIds, Messages
 from src.bot.views.base_view import BasePollView, SafePollButton
@@ -18,7 +19,7 @@ from src.bot.views.poll_admin_view import PollAdminView  # Import PollAdminView
 logger = logging.getLogger(__name__)
 
 class PollOptionButton(discord.ui.Button):
-    def __init__(self, label: str, custom_id: str, row: int):
+    def __init__(self, label: str, custom_id: str, row: int, option_index: int):
         super().__init__(
             style=discord.ButtonStyle.secondary,
             label=label,
@@ -26,6 +27,8 @@ class PollOptionButton(discord.ui.Button):
             row=row
         )
         self.logger = logging.getLogger(__name__)
+        # Selections are stored by option index, like votes and correct answers
+        self.option_index = option_index
 
     async def callback(self, interaction: discord.Interaction):
         """Handle button click with state persistence and recovery."""
@@ -120,10 +123,14 @@ class PollOptionButton(discord.ui.Button):
                         selection = await poll_service.add_selection(
                             poll_id=poll_id,
                             user_id=str(interaction.user.id),
-                            selection=self.label
+                            selection=str(self.option_index)
                         )
                         logger.info(f"Selection processed: {selection.selections if selection else None}")
                         
+                        # Show the option texts for the stored indices
+                        option_labels = {str(option.index): option.text for option in poll.options}
+                        selected_labels = ', '.join(option_labels.get(idx, idx) for idx in selection.selections)
+                        
                         # Persist UI state with retries
                         new_state = {
                             'selections': selection.selections,
@@ -141,7 +148,7 @@ class PollOptionButton(discord.ui.Button):
                         except discord.NotFound:
                             logger.warning("Original message not found, creating new response")
                             await interaction.followup.send(
-                                content=f"Your selections: {', '.join(selection.selections)}",
+                                content=f"Your selections: {selected_labels}",
                                 ephemeral=True
                             )
                         except Exception as e:
@@ -150,7 +157,7 @@ class PollOptionButton(discord.ui.Button):
                         
                         # Send confirmation
                         await interaction.followup.send(
-                            f"Your selections: {', '.join(selection.selections)}",
+                            f"Your selections: {selected_labels}",
                             ephemeral=True
                         )
                         logger.info("Confirmation sent")
@@ -227,7 +234,8 @@ class PollView(BasePollView):
                 button = PollOptionButton(
                     label=option.text,
                     custom_id=f"poll_{self.poll_id}_option_{option.id}",
-                    row=i // 2
+                    row=i // 2,
+                    option_index=option.index
                 )
                 self.add_item(button)
                 logger.info(f"Added button for option: {option.text} with custom_id: {button.custom_id}")
@@ -276,23 +284,18 @@ class PollView(BasePollView):
                 active_polls = await poll_service.get_active_polls()
                 logger.info(f"Found {len(active_polls)} active polls to recover")
                 
-                for poll in active_polls:
+                # Get the most recent message for every poll with one query
+                loader = PollMessageLoader(session)
+                poll_messages = await asyncio.gather(
+                    *(loader.load(poll.id) for poll in active_polls)
+                )
+                
+                for poll, poll_message in zip(active_polls, poll_messages):
                     try:
                         # Create new view for the poll
                         view = PollView(poll, bot)
                         logger.info(f"Created new view for poll {poll.id}")
                         
-                        # Get the most recent message for this poll
-                        stmt = select(PollMessage).where(
-                            and_(
-                                PollMessage.poll_id == poll.id,
-                                PollMessage.message_type == 'poll'
-                            )
-                        ).order_by(desc(PollMessage.created_at))
-                        
-                        result = await session.execute(stmt)
-                        poll_message = result.scalar_one_or_none()
-                        
                         if poll_message:
                             try:
                                 # Try to get the channel and message
@@ -311,7 +314,7 @@ class PollView(BasePollView):
                                             continue
                                     except discord.NotFound:
                                         logger.warning(f"Message {poll_message.message_id} not found for poll {poll.id}")
-                                        session.delete(poll_message)
+                                        await session.delete(poll_message)
                                         await session.commit()
                             except Exception as e:
                                 logger.error(f"Error recovering message for poll {poll.id}: {e}")
@@ -797,6 +800,7 @@ class RevealAnswerButton(SafePollButton):
             poll = await poll_service.reveal_poll(poll.id)
             points_updates = await points_service.calculate_poll_points(poll.id)
             logger.info(f"Points calculated: {points_updates}")
+            await session.commit()
             
             # Get global leaderboard
             leaderboard = await points_service.get_leaderboard(limit=10)
@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from typing import List, Optional
 from sqlalchemy import Column, BigInteger, String, DateTime, Boolean, ForeignKey, JSON, Enum as SQLEnum, Integer, UniqueConstraint, TypeDecorator
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 import enum
 
 from .database import Base
@@ -13,6 +13,9 @@ class TZDateTime(TypeDecorator):
     def process_bind_param(self, value, dialect):
         """Convert timezone-aware datetime to naive UTC before saving to DB."""
         if value is not None and value.tzinfo is not None:
+            # UTC values (the usual case) only need their tzinfo dropped
+            if value.tzinfo is timezone.utc:
+                return value.replace(tzinfo=None)
             # Convert to UTC then remove tzinfo
             return value.astimezone(timezone.utc).replace(tzinfo=None)
         return value
@@ -23,6 +26,12 @@ class TZDateTime(TypeDecorator):
             return value.replace(tzinfo=timezone.utc)
         return value
 
+def _normalize_option_list(value):
+    """Store option identifiers as strings so reads can compare them without str()."""
+    if value is None:
+        return None
+    return [str(x) for x in value]
+
 class PollStatus(enum.Enum):
     OPEN = "open"
     CLOSED = "closed"
@@ -72,15 +81,21 @@ class Poll(Base):
 
     # Relationships
     options = relationship("PollOption", back_populates="poll", cascade="all, delete-orphan")
-    selections = relationship("UserPollSelection", back_populates="poll", cascade="all, delete-orphan")
+    # Vote and message collections must be loaded explicitly (selectinload) and are
+    # removed by the ON DELETE CASCADE foreign keys rather than loaded on delete
+    selections = relationship("UserPollSelection", back_populates="poll", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
     guild = relationship("Guild", back_populates="polls")
-    messages = relationship("PollMessage", back_populates="poll", cascade="all, delete-orphan")
+    messages = relationship("PollMessage", back_populates="poll", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
     ui_states = relationship("UIState", back_populates="poll", cascade="all, delete-orphan")
-    votes = relationship("Vote", back_populates="poll", cascade="all, delete-orphan")
+    votes = relationship("Vote", back_populates="poll", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
 
     # Note: The unique constraint is handled by a partial index in the database
     # CREATE UNIQUE INDEX uq_active_poll_per_guild_type ON polls_polls (guild_id, poll_type) WHERE is_active = true;
 
+    @validates("correct_answers")
+    def _validate_correct_answers(self, key, value):
+        return _normalize_option_list(value)
+
     @property
     def status(self) -> PollStatus:
         """Get the status of the poll."""
@@ -116,6 +131,14 @@ class UserPollSelection(Base):
     # Relationships
     poll = relationship("Poll", back_populates="selections")
 
+    @validates("selections")
+    def _validate_selections(self, key, value):
+        return _normalize_option_list(value)
+
+    __table_args__ = (
+        UniqueConstraint('poll_id', 'user_id', name='unique_user_poll_selection'),
+    )
+
 class UserScore(Base):
     __tablename__ = "polls_user_scores"
 
@@ -167,6 +190,10 @@ class PollMessage(Base):
         """Check if the message is still valid."""
         return bool(self.message_id and self.channel_id)
 
+    __table_args__ = (
+        UniqueConstraint('poll_id', 'channel_id', 'message_id', name='unique_poll_message'),
+    )
+
 class UIState(Base):
     """Tracks UI state for polls."""
     __tablename__ = "polls_ui_states"
@@ -194,6 +221,10 @@ class Vote(Base):
     # Relationships
     poll = relationship("Poll", back_populates="votes")
 
+    @validates("option_ids")
+    def _validate_option_ids(self, key, value):
+        return _normalize_option_list(value)
+
     __table_args__ = (
         UniqueConstraint('poll_id', 'user_id', name='unique_user_poll_vote'),
     )
@@ -1,10 +1,10 @@
 from typing import Optional, List, Dict
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, and_, desc, func, delete
+from sqlalchemy import select, update, and_
 from datetime import datetime
 
-from src.database.models import Guild, PollTypeLeaderboard, UserScore, AdminRole, Poll
+from src.database.models import Guild, PollTypeLeaderboard, AdminRole
 from src.utils.exceptions import GuildError
 
 logger = logging.getLogger(__name__)
@@ -56,59 +56,6 @@ class GuildService:
             await self.session.rollback()
             raise GuildError(f"Failed to deactivate guild: {str(e)}")
 
-    async def update_guild_leaderboard(self, guild_id: int) -> None:
-        """Update the cached leaderboard for a guild."""
-        try:
-            # Get all user scores for the guild
-            stmt = (
-                select(UserScore)
-                .where(UserScore.guild_id == guild_id)
-                .order_by(desc(UserScore.points))
-            )
-            result = await self.session.execute(stmt)
-            scores = result.scalars().all()
-
-            # Group scores by poll_type
-            poll_type_scores = {}
-            for score in scores:
-                poll_type = score.poll_type
-                if poll_type not in poll_type_scores:
-                    poll_type_scores[poll_type] = []
-                poll_type_scores[poll_type].append(score)
-
-            # Update leaderboard for each poll_type
-            for poll_type, scores in poll_type_scores.items():
-                # Delete existing leaderboard entries for this poll_type in this guild
-                await self.session.execute(
-                    delete(PollTypeLeaderboard).where(
-                        and_(
-                            PollTypeLeaderboard.guild_id == guild_id,
-                            PollTypeLeaderboard.poll_type == poll_type
-                        )
-                    )
-                )
-
-                # Create new leaderboard entries
-                for rank, score in enumerate(scores, 1):
-                    leaderboard_entry = PollTypeLeaderboard(
-                        guild_id=guild_id,
-                        poll_type=poll_type,
-                        user_id=score.user_id,
-                        points=score.points,
-                        total_correct=score.total_correct,
-                        rank=rank,
-                        last_updated=datetime.utcnow()
-                    )
-                    self.session.add(leaderboard_entry)
-
-            await self.session.commit()
-            logger.info(f"Updated leaderboards for guild {guild_id}")
-
-        except Exception as e:
-            logger.error(f"Error updating guild leaderboard: {e}", exc_info=True)
-            await self.session.rollback()
-            raise GuildError(f"Failed to update guild leaderboard: {str(e)}")
-
     async def get_guild_leaderboard(self, guild_id: int, poll_type: str, limit: int = 10) -> List[Dict]:
         """Get the cached leaderboard for a guild's poll type."""
         try:
@@ -0,0 +1,80 @@
+from typing import Optional, Dict, List
+import asyncio
+import logging
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, desc
+
+from src.database.models import PollMessage
+
+logger = logging.getLogger(__name__)
+
+class PollMessageLoader:
+    """Batches PollMessage lookups made in the same event loop tick into one query.
+
+    Create one loader per session (an interaction or a background task run) and
+    await load() concurrently, e.g. with asyncio.gather, to resolve many polls at once.
+    Queries run on one dispatch task at a time, so don't use the session yourself
+    while loads are still outstanding.
+    """
+
+    def __init__(self, session: AsyncSession, message_type: str = 'poll'):
+        self.session = session
+        self.message_type = message_type
+        self.logger = logging.getLogger(__name__)
+        self._pending: Dict[int, asyncio.Future] = {}
+        # The one task allowed to query the session; AsyncSession can't run two at once
+        self._dispatch_task: Optional[asyncio.Task] = None
+
+    async def load(self, poll_id: int) -> Optional[PollMessage]:
+        """Get the most recent message of this loader's type for a poll."""
+        future = self._pending.get(poll_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[poll_id] = future
+            if self._dispatch_task is None or self._dispatch_task.done():
+                # The task first runs after every caller of this tick has queued up;
+                # lookups queued while a query is in flight join the next batch
+                self._dispatch_task = loop.create_task(self._dispatch())
+        return await future
+
+    async def _dispatch(self) -> None:
+        """Resolve pending lookups one batch at a time, each with a single SELECT ... WHERE poll_id IN (...)."""
+        while self._pending:
+            pending, self._pending = self._pending, {}
+            try:
+                latest = await self._fetch_latest(list(pending))
+            except asyncio.CancelledError:
+                # Nothing will resolve these lookups, including any queued meanwhile
+                for future in [*pending.values(), *self._pending.values()]:
+                    future.cancel()
+                self._pending = {}
+                raise
+            except Exception as e:
+                self.logger.error(f"Error loading poll messages: {e}", exc_info=True)
+                for future in pending.values():
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for poll_id, future in pending.items():
+                if not future.done():
+                    future.set_result(latest.get(poll_id))
+
+    async def _fetch_latest(self, poll_ids: List[int]) -> Dict[int, PollMessage]:
+        """Newest message of this loader's type for each of poll_ids."""
+        stmt = (
+            select(PollMessage)
+            .where(
+                PollMessage.poll_id.in_(poll_ids),
+                PollMessage.message_type == self.message_type
+            )
+            .order_by(desc(PollMessage.created_at))
+        )
+        result = await self.session.execute(stmt)
+
+        # Rows are newest first, so keep the first message seen for each poll
+        latest: Dict[int, PollMessage] = {}
+        for message in result.scalars():
+            latest.setdefault(message.poll_id, message)
+        return latest
@@ -1,15 +1,137 @@
 from typing import List, Dict, Optional
+from collections import defaultdict
 from datetime import datetime, timezone
 import logging
-from sqlalchemy import select, and_, func, desc, delete, case, String, text
+from sqlalchemy import select, and_, func, desc, delete, Integer, text, update, distinct, cast, literal
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.dialects import postgresql
 
-from src.database.models import Poll, UserScore, PollTypeLeaderboard, PollStatus, UserPollSelection, Vote
-from src.utils.exceptions import PollError
+from src.database.models import Poll, UserScore, PollTypeLeaderboard, UserPollSelection, Vote
+from src.utils.exceptions import PollError, PointsError
+from src.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Columns read by leaderboard consumers; selecting them directly returns
+# lightweight rows instead of hydrating PollTypeLeaderboard instances
+LEADERBOARD_COLUMNS = (
+    PollTypeLeaderboard.user_id,
+    PollTypeLeaderboard.points,
+    PollTypeLeaderboard.total_correct,
+    PollTypeLeaderboard.rank,
+)
+
+# Aggregates each user's score over all revealed polls of one guild and poll type.
+# One point per selected option found in correct_answers; selections only count
+# for polls without rows in polls_votes, as in calculate_poll_points. Ranks use
+# the same RANK() ordering as _rerank_leaderboard.
+REBUILD_LEADERBOARD_SQL = """
+    WITH guild_polls AS (
+        SELECT id, correct_answers
+        FROM polls_polls
+        WHERE guild_id = :guild_id
+          AND poll_type = :poll_type
+          AND is_revealed = true
+          AND correct_answers IS NOT NULL
+          AND json_array_length(correct_answers) > 0
+    ),
+    entries AS (
+        SELECT 'vote' AS source, v.id, v.poll_id, v.user_id, v.option_ids AS options
+        FROM polls_votes v
+        JOIN guild_polls p ON p.id = v.poll_id
+        UNION ALL
+        SELECT 'selection' AS source, s.id, s.poll_id, s.user_id, s.selections AS options
+        FROM polls_user_poll_selections s
+        JOIN guild_polls p ON p.id = s.poll_id
+        WHERE json_array_length(s.selections) > 0
+          AND NOT EXISTS (SELECT 1 FROM polls_votes v WHERE v.poll_id = s.poll_id)
+    ),
+    correct AS (
+        SELECT p.id AS poll_id, c.option_id
+        FROM guild_polls p
+        CROSS JOIN LATERAL json_array_elements_text(p.correct_answers) AS c(option_id)
+    ),
+    scored AS (
+        -- Explode each entry's options and join them against the correct options;
+        -- LEFT JOINs keep entries with no options or no hits at zero points
+        SELECT e.user_id, COUNT(DISTINCT c.option_id) AS points
+        FROM entries e
+        LEFT JOIN LATERAL json_array_elements_text(e.options) AS o(option_id) ON true
+        LEFT JOIN correct c ON c.poll_id = e.poll_id AND c.option_id = o.option_id
+        GROUP BY e.source, e.id, e.user_id
+    )
+    INSERT INTO polls_poll_type_leaderboards
+        (guild_id, poll_type, user_id, points, total_correct, rank, last_updated)
+    SELECT
+        :guild_id,
+        :poll_type,
+        user_id,
+        SUM(points),
+        COUNT(*) FILTER (WHERE points > 0),
+        RANK() OVER (ORDER BY SUM(points) DESC, COUNT(*) FILTER (WHERE points > 0) DESC),
+        now() AT TIME ZONE 'utc'
+    FROM scored
+    GROUP BY user_id
+"""
+
+# Leaderboards are rebuilt on reveal, so serving reads a few seconds stale is fine.
+# Keys are ("leaderboard", guild_id, poll_type, limit) and
+# ("user_points", guild_id, poll_type, user_id).
+LEADERBOARD_CACHE_TTL = 30
+_leaderboard_cache = TTLCache(ttl=LEADERBOARD_CACHE_TTL)
+_CACHE_MISS = object()
+
+# Rows fetched per round trip when streaming votes and selections
+STREAM_BATCH_SIZE = 1000
+
+# Rows per multi-VALUES upsert statement, keeping bind parameters well under the driver limit
+UPSERT_CHUNK_SIZE = 1000
+
+# From this many participants on, poll results are loaded with COPY into a staging table
+COPY_UPSERT_THRESHOLD = 5000
+
+# Session-local staging table for COPY loads; ON COMMIT DELETE ROWS empties it per transaction
+LEADERBOARD_STAGING_DDL = """
+    CREATE TEMP TABLE IF NOT EXISTS polls_leaderboard_staging (
+        user_id VARCHAR NOT NULL,
+        points INTEGER NOT NULL,
+        total_correct INTEGER NOT NULL
+    ) ON COMMIT DELETE ROWS
+"""
+
+LEADERBOARD_STAGING_UPSERT_SQL = """
+    INSERT INTO polls_poll_type_leaderboards
+        (guild_id, poll_type, user_id, points, total_correct, rank, last_updated)
+    SELECT :guild_id, :poll_type, user_id, points, total_correct, 0, now() AT TIME ZONE 'utc'
+    FROM polls_leaderboard_staging
+    ON CONFLICT (guild_id, poll_type, user_id) DO UPDATE SET
+        points = polls_poll_type_leaderboards.points + EXCLUDED.points,
+        total_correct = polls_poll_type_leaderboards.total_correct + EXCLUDED.total_correct,
+        last_updated = EXCLUDED.last_updated
+"""
+
+def _correct_count_column(options_column, correct_answers):
+    """SQL expression counting the distinct options in options_column that are correct.
+
+    Scoring runs inside Postgres as the rows are read, so the Python loop over
+    votes only accumulates the returned counts.
+    """
+    if not correct_answers:
+        # Nothing can score, so skip touching the option lists at all
+        return literal(0)
+    
+    if len(correct_answers) == 1:
+        # Single-answer polls, the common case: one jsonb key test instead of
+        # exploding the option list
+        return cast(cast(options_column, postgresql.JSONB).has_key(correct_answers[0]), Integer)
+    
+    options = func.json_array_elements_text(options_column).table_valued("value")
+    return (
+        select(func.count(distinct(options.c.value)))
+        .where(options.c.value.in_(list(correct_answers)))
+        .scalar_subquery()
+    )
+
 class PointsService:
     def __init__(self, session: AsyncSession):
         self.session = session
@@ -25,9 +147,10 @@ class PointsService:
             result = await self.session.execute(poll_stmt)
             poll = result.scalar_one_or_none()
         except Exception as e:
+            # No rollback here: this runs inside the caller's reveal transaction,
+            # which decides whether to roll back
             self.logger.error(f"Database error getting poll: {e}", exc_info=True)
-            await self.session.rollback()
-            return []
+            raise PointsError(f"Failed to get poll {poll_id}: {str(e)}")
         
         if not poll:
             self.logger.error(f"Poll {poll_id} not found")
@@ -37,145 +160,129 @@ class PointsService:
             self.logger.error(f"Poll {poll_id} is not revealed yet")
             return []
             
-        # Ensure poll.correct_answers is not None
-        if poll.correct_answers is None:
+        # Use a local list rather than assigning to poll.correct_answers, which would
+        # mark the poll dirty and write an empty list back on the next flush
+        correct_answers = poll.correct_answers or []
+        if not correct_answers:
             self.logger.warning(f"Poll {poll_id} has no correct answers defined")
-            poll.correct_answers = []
             
         # Log correct answers for debugging
-        self.logger.info(f"Poll {poll_id} correct_answers: {poll.correct_answers} (type: {type(poll.correct_answers)})")
+        self.logger.info(f"Poll {poll_id} correct_answers: {correct_answers}")
 
         points_updates = []
-        # Track user points to update leaderboard directly
-        user_points = {}
+        # Track user points to update leaderboard directly; missing users start at zero
+        user_points = defaultdict(lambda: {"points": 0, "total_correct": 0})
         
         # Try to get votes from both tables to ensure we capture all votes
         try:
-            # First try the Vote table
-            stmt = select(Vote).where(Vote.poll_id == poll_id)
-            result = await self.session.execute(stmt)
-            votes = result.scalars().all()
-            self.logger.info(f"Found {len(votes)} votes in Vote table for poll {poll_id}")
+            # First try the Vote table, streaming rows so large polls aren't held in memory at once
+            stmt = (
+                select(
+                    Vote.user_id,
+                    Vote.option_ids,
+                    _correct_count_column(Vote.option_ids, correct_answers).label("points")
+                )
+                .where(Vote.poll_id == poll_id)
+                .execution_options(yield_per=STREAM_BATCH_SIZE)
+            )
+            # Per-vote logging is debug only; check the level once rather than per row
+            debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
             
-            # If we have votes in the Vote table, process them
-            if votes:
-                # Convert correct answers to a set of strings for consistent comparison
-                correct_set = set(str(x) for x in poll.correct_answers)
+            vote_count = 0
+            try:
+                async for vote in await self.session.stream(stmt):
+                    vote_count += 1
+                    user_id = vote.user_id
+                    if vote.option_ids is None:
+                        self.logger.error(f"Vote for user {user_id} has no option_ids, skipping")
+                        # Still include the user in points_updates but flag that there was an issue
+                        points_updates.append({
+                            "user_id": user_id,
+                            "poll_points": 0,
+                            "is_successful": False,
+                            "error": True
+                        })
+                        continue
+                    
+                    # 1 point for each correct answer, counted by the query
+                    points = vote.points
+                    is_successful = points > 0  # Successful if at least one correct answer
+                    
+                    if debug_enabled:
+                        self.logger.debug(
+                            "User %s selected %s, got %d points, successful: %s",
+                            user_id, vote.option_ids, points, is_successful
+                        )
+                    
+                    # Store points for leaderboard update
+                    entry = user_points[user_id]
+                    entry["points"] += points
+                    if is_successful:
+                        entry["total_correct"] += 1
+                    
+                    points_updates.append({
+                        "user_id": user_id,
+                        "poll_points": points,
+                        "is_successful": is_successful
+                    })
+            except Exception as e:
+                self.logger.error(f"Error processing vote #{vote_count} for poll {poll_id}: {e}")
+                raise
+            self.logger.info(f"Found {vote_count} votes in Vote table for poll {poll_id}")
+            
+            if not vote_count:
+                # If no votes were found in the Vote table, try the UserPollSelection table
+                self.logger.info(f"No votes found in Vote table for poll {poll_id}, trying UserPollSelection table")
+                stmt = (
+                    select(
+                        UserPollSelection.user_id,
+                        UserPollSelection.selections,
+                        _correct_count_column(UserPollSelection.selections, correct_answers).label("points")
+                    )
+                    .where(UserPollSelection.poll_id == poll_id)
+                    .execution_options(yield_per=STREAM_BATCH_SIZE)
+                )
                 
-                for vote in votes:
-                    try:
-                        user_id = vote.user_id
-                        # Convert vote options to strings for consistent comparison
-                        user_set = set(str(x) for x in vote.option_ids)
-                        
-                        # Calculate points - 1 point for each correct answer
-                        user_correct_answers = user_set & correct_set
-                        
-                        # Log the comparison results
-                        self.logger.info(f"User {user_id} - correct_set: {correct_set}, user_set: {user_set}, intersection: {user_correct_answers}")
+                selection_count = 0
+                try:
+                    async for selection in await self.session.stream(stmt):
+                        selection_count += 1
+                        # Only selections with at least one option contribute points
+                        if not selection.selections:
+                            continue
                         
-                        points = len(user_correct_answers)  # Points = number of correct selections
-                        is_successful = len(user_correct_answers) > 0  # Successful if at least one correct answer
+                        user_id = selection.user_id
+                        # 1 point for each correct answer, counted by the query
+                        points = selection.points
+                        is_successful = points > 0  # Successful if at least one correct answer
                         
-                        self.logger.info(
-                            f"User {user_id} selected {vote.option_ids}, "
-                            f"correct answers {poll.correct_answers}, got {points} points, "
-                            f"successful: {is_successful}"
-                        )
+                        if debug_enabled:
+                            self.logger.debug(
+                                "User %s selected %s, got %d points, successful: %s",
+                                user_id, selection.selections, points, is_successful
+                            )
                         
                         # Store points for leaderboard update
-                        if user_id not in user_points:
-                            user_points[user_id] = {
-                                "points": 0,
-                                "total_correct": 0
-                            }
-                        
-                        user_points[user_id]["points"] += points
+                        entry = user_points[user_id]
+                        entry["points"] += points
                         if is_successful:
-                            user_points[user_id]["total_correct"] += 1
+                            entry["total_correct"] += 1
                         
                         points_updates.append({
                             "user_id": user_id,
                             "poll_points": points,
                             "is_successful": is_successful
                         })
-                    except Exception as e:
-                        # Log error but continue processing other votes
-                        self.logger.error(f"Error processing vote for user {vote.user_id}: {e}")
-                        # Still include the user in points_updates but flag that there was an issue
-                        points_updates.append({
-                            "user_id": vote.user_id,
-                            "poll_points": 0,
-                            "is_successful": False,
-                            "error": True
-                        })
-            else:
-                # If no votes were found in the Vote table, try the UserPollSelection table
-                self.logger.info(f"No votes found in Vote table for poll {poll_id}, trying UserPollSelection table")
-                stmt = select(UserPollSelection).where(UserPollSelection.poll_id == poll_id)
-                result = await self.session.execute(stmt)
-                selections = result.scalars().all()
-                self.logger.info(f"Found {len(selections)} selections in UserPollSelection table for poll {poll_id}")
+                except Exception as e:
+                    self.logger.error(f"Error processing selection #{selection_count} for poll {poll_id}: {e}")
+                    raise
+                self.logger.info(f"Found {selection_count} selections in UserPollSelection table for poll {poll_id}")
                 
-                if selections:
-                    # Convert correct answers to a set of strings for consistent comparison
-                    correct_set = set(str(x) for x in poll.correct_answers)
-                    
-                    for selection in selections:
-                        try:
-                            user_id = selection.user_id
-                            # Parse selections from the UserPollSelection
-                            if selection.selections:
-                                # Convert selection options to strings for consistent comparison
-                                user_set = set(str(x) for x in selection.selections)
-                                
-                                # Calculate points - 1 point for each correct answer
-                                user_correct_answers = user_set & correct_set
-                                
-                                # Log the comparison results
-                                self.logger.info(f"User {user_id} - correct_set: {correct_set}, user_set: {user_set}, intersection: {user_correct_answers}")
-                                
-                                points = len(user_correct_answers)  # Points = number of correct selections
-                                is_successful = len(user_correct_answers) > 0  # Successful if at least one correct answer
-                                
-                                self.logger.info(
-                                    f"User {user_id} selected {selection.selections}, "
-                                    f"correct answers {poll.correct_answers}, got {points} points, "
-                                    f"successful: {is_successful}"
-                                )
-                                
-                                # Store points for leaderboard update
-                                if user_id not in user_points:
-                                    user_points[user_id] = {
-                                        "points": 0,
-                                        "total_correct": 0
-                                    }
-                                
-                                user_points[user_id]["points"] += points
-                                if is_successful:
-                                    user_points[user_id]["total_correct"] += 1
-                                
-                                points_updates.append({
-                                    "user_id": user_id,
-                                    "poll_points": points,
-                                    "is_successful": is_successful
-                                })
-                        except Exception as e:
-                            # Log error but continue processing other selections
-                            self.logger.error(f"Error processing selection for user {selection.user_id}: {e}")
-                            # Still include the user in points_updates but flag that there was an issue
-                            points_updates.append({
-                                "user_id": selection.user_id,
-                                "poll_points": 0,
-                                "is_successful": False,
-                                "error": True
-                            })
-                else:
+                if not selection_count:
                     self.logger.warning(f"No votes or selections found for poll {poll_id}")
         except Exception as e:
             self.logger.error(f"Database error getting votes: {e}", exc_info=True)
-            await self.session.rollback()
-            return []
+            raise PointsError(f"Failed to get votes for poll {poll_id}: {str(e)}")
             
         try:
             # Update leaderboard directly
@@ -186,109 +293,40 @@ class PointsService:
                     poll_type=poll.poll_type,
                     user_points=user_points
                 )
+                self.logger.info(f"Successfully updated points for poll {poll_id}")
             else:
                 self.logger.warning(f"No points to update for poll {poll_id}")
-                
-            # Commit all changes
-            await self.session.commit()
-            self.logger.info(f"Successfully committed points updates for poll {poll_id}")
+            
+            # No commit here - the reveal flow commits once for the whole operation
         except Exception as e:
+            # Raise so the caller rolls back the reveal too; a poll must never be
+            # committed as revealed without its points on the leaderboard
             self.logger.error(f"Error updating leaderboard: {e}", exc_info=True)
-            # Roll back any pending changes
-            try:
-                await self.session.rollback()
-            except Exception as rollback_error:
-                self.logger.error(f"Error rolling back transaction: {rollback_error}", exc_info=True)
+            raise PointsError(f"Failed to update leaderboard for poll {poll_id}: {str(e)}")
         
         return points_updates
 
     async def update_poll_type_leaderboard(self, guild_id: int, poll_type: str, user_points: Dict[str, Dict]) -> None:
         """Update leaderboard entries for users who participated in a poll."""
         self.logger.info(f"Updating poll type leaderboard for guild {guild_id}, poll type {poll_type}")
+        now = datetime.now(timezone.utc)
         
         try:
-            # Get current leaderboard entries for these users
-            user_ids = list(user_points.keys())
-            if not user_ids:
+            if not user_points:
                 self.logger.info(f"No users to update in leaderboard")
                 return
                 
-            self.logger.info(f"Incrementally updating leaderboard for {len(user_ids)} users")
-            
-            # First, get existing entries for these users
-            existing_entries_stmt = select(PollTypeLeaderboard).where(
-                and_(
-                    PollTypeLeaderboard.guild_id == guild_id,
-                    PollTypeLeaderboard.poll_type == poll_type,
-                    PollTypeLeaderboard.user_id.in_(user_ids)
-                )
-            )
-            
-            result = await self.session.execute(existing_entries_stmt)
-            existing_entries = {entry.user_id: entry for entry in result.scalars().all()}
+            self.logger.info(f"Incrementally updating leaderboard for {len(user_points)} users")
             
-            # Get all existing leaderboard entries to recalculate ranks
-            all_entries_stmt = select(PollTypeLeaderboard).where(
-                and_(
-                    PollTypeLeaderboard.guild_id == guild_id,
-                    PollTypeLeaderboard.poll_type == poll_type
-                )
-            )
-            
-            result = await self.session.execute(all_entries_stmt)
-            all_entries = {entry.user_id: entry for entry in result.scalars().all()}
-            
-            # Update existing entries and add new entries
-            for user_id, points_data in user_points.items():
-                if user_id in existing_entries:
-                    # Update existing entry
-                    entry = existing_entries[user_id]
-                    entry.points += points_data["points"]
-                    entry.total_correct += points_data["total_correct"]
-                    entry.last_updated = datetime.now(timezone.utc)
-                    self.logger.info(f"Updated existing entry for user {user_id}: points={entry.points}, total_correct={entry.total_correct}")
-                else:
-                    # Create new entry
-                    new_entry = PollTypeLeaderboard(
-                        guild_id=guild_id,
-                        poll_type=poll_type,
-                        user_id=user_id,
-                        points=points_data["points"],
-                        total_correct=points_data["total_correct"],
-                        rank=0,  # Will be updated below
-                        last_updated=datetime.now(timezone.utc)
-                    )
-                    self.session.add(new_entry)
-                    all_entries[user_id] = new_entry
-                    self.logger.info(f"Created new entry for user {user_id}: points={points_data['points']}, total_correct={points_data['total_correct']}")
-            
-            # Now recalculate ranks based on updated points
-            # Convert to list for sorting
-            entries_list = list(all_entries.values())
-            entries_list.sort(key=lambda x: (-x.points, -x.total_correct))
-            
-            # Update ranks
-            current_rank = 1
-            prev_points = None
-            prev_correct = None
-            
-            for i, entry in enumerate(entries_list):
-                # Handle ties
-                if prev_points is not None and prev_correct is not None:
-                    if entry.points != prev_points or entry.total_correct != prev_correct:
-                        current_rank = i + 1
-                
-                entry.rank = current_rank
-                prev_points = entry.points
-                prev_correct = entry.total_correct
-                
-                self.logger.info(f"Updated rank for user {entry.user_id}: points={entry.points}, rank={entry.rank}")
+            if len(user_points) >= COPY_UPSERT_THRESHOLD:
+                await self._copy_upsert_leaderboard(guild_id, poll_type, user_points)
+            else:
+                await self._values_upsert_leaderboard(guild_id, poll_type, user_points, now)
             
-            # Flush changes to the database
-            await self.session.flush()
+            # Recalculate ranks in the database over the updated standings
+            await self._rerank_leaderboard(guild_id, poll_type)
             
-            # Verify the updates
-            self.logger.info(f"Verification: {len(entries_list)} leaderboard entries updated for guild {guild_id}, poll type {poll_type}")
+            self.invalidate_cached_leaderboard(guild_id, poll_type)
             
             # Mark success
             self.logger.info(f"Successfully updated poll type leaderboard for guild {guild_id}, poll type {poll_type}")
@@ -296,6 +334,108 @@ class PointsService:
             self.logger.error(f"Error updating poll type leaderboard: {e}", exc_info=True)
             raise Exception(f"Failed to update leaderboard: {str(e)}")
 
+    async def _values_upsert_leaderboard(self, guild_id: int, poll_type: str, user_points: Dict[str, Dict], now: datetime) -> None:
+        """Add poll results to the leaderboard with multi-VALUES INSERT ... ON CONFLICT statements."""
+        rows = [
+            {
+                "guild_id": guild_id,
+                "poll_type": poll_type,
+                "user_id": user_id,
+                "points": points_data["points"],
+                "total_correct": points_data["total_correct"],
+                "rank": 0,  # Assigned by _rerank_leaderboard below
+                "last_updated": now
+            }
+            for user_id, points_data in user_points.items()
+        ]
+        
+        # Add this poll's points to existing rows and create missing ones in one
+        # statement per chunk, instead of loading and updating each entry
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = postgresql.insert(PollTypeLeaderboard).values(rows[start:start + UPSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    PollTypeLeaderboard.guild_id,
+                    PollTypeLeaderboard.poll_type,
+                    PollTypeLeaderboard.user_id
+                ],
+                set_={
+                    "points": PollTypeLeaderboard.points + stmt.excluded.points,
+                    "total_correct": PollTypeLeaderboard.total_correct + stmt.excluded.total_correct,
+                    "last_updated": stmt.excluded.last_updated
+                }
+            )
+            await self.session.execute(stmt)
+
+    async def _copy_upsert_leaderboard(self, guild_id: int, poll_type: str, user_points: Dict[str, Dict]) -> None:
+        """Add poll results to the leaderboard by COPYing them into a staging table first.
+        
+        COPY sends all rows as one data stream, which is much cheaper than
+        binding parameters when a poll has thousands of participants.
+        """
+        await self.session.execute(text(LEADERBOARD_STAGING_DDL))
+        # Clear rows from an earlier load in this same transaction
+        await self.session.execute(text("DELETE FROM polls_leaderboard_staging"))
+        
+        # SQLAlchemy doesn't expose COPY, so use the asyncpg connection under this session
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "polls_leaderboard_staging",
+            records=[
+                (user_id, points_data["points"], points_data["total_correct"])
+                for user_id, points_data in user_points.items()
+            ],
+            columns=["user_id", "points", "total_correct"]
+        )
+        
+        await self.session.execute(
+            text(LEADERBOARD_STAGING_UPSERT_SQL),
+            {"guild_id": guild_id, "poll_type": poll_type}
+        )
+
+    def invalidate_cached_leaderboard(self, guild_id: int, poll_type: str) -> None:
+        """Drop cached reads for a guild's poll type after its standings change.
+        
+        Writers call this when they update the rows; callers that own the
+        transaction call it again after commit, so reads cached by other sessions
+        before the commit are not served afterwards.
+        """
+        _leaderboard_cache.invalidate(lambda key: key[1] == guild_id and key[2] == poll_type)
+
+    async def _rerank_leaderboard(self, guild_id: int, poll_type: str) -> None:
+        """Recompute ranks for a guild's poll type leaderboard with a single UPDATE.
+        
+        Ties share a rank (RANK() semantics) when both points and total_correct
+        are equal, matching the ordering used when reading the leaderboard.
+        """
+        ranked = (
+            select(
+                PollTypeLeaderboard.id,
+                func.rank().over(
+                    order_by=(
+                        desc(PollTypeLeaderboard.points),
+                        desc(PollTypeLeaderboard.total_correct)
+                    )
+                ).label("new_rank")
+            )
+            .where(
+                and_(
+                    PollTypeLeaderboard.guild_id == guild_id,
+                    PollTypeLeaderboard.poll_type == poll_type
+                )
+            )
+            .subquery()
+        )
+        rank_stmt = (
+            update(PollTypeLeaderboard)
+            .where(PollTypeLeaderboard.id == ranked.c.id)
+            .values(rank=ranked.c.new_rank)
+            .execution_options(synchronize_session="fetch")
+        )
+        result = await self.session.execute(rank_stmt)
+        self.logger.info(f"Re-ranked {result.rowcount} leaderboard entries for guild {guild_id}, poll type {poll_type}")
+
     async def _update_user_score(
         self,
         user_id: str,
@@ -305,6 +445,7 @@ class PointsService:
         is_successful: bool
     ) -> None:
         """Update a user's score."""
+        now = datetime.now(timezone.utc)
         try:
             self.logger.info(f"Updating score for user {user_id} in guild {guild_id}, poll type {poll_type}")
             self.logger.info(f"Points to add: {points}, Is successful: {is_successful}")
@@ -329,7 +470,7 @@ class PointsService:
                     user_score.total_correct += 1
                 # Update last successful timestamp if this poll was successful
                 if is_successful:
-                    user_score.last_successful = datetime.utcnow()
+                    user_score.last_successful = now
             else:
                 # Create new score
                 self.logger.info(f"Creating new score for user {user_id} with {points} points")
@@ -340,7 +481,7 @@ class PointsService:
                     points=points,
                     polls_participated=1,
                     total_correct=1 if is_successful else 0,
-                    last_successful=datetime.utcnow() if is_successful else None
+                    last_successful=now if is_successful else None
                 )
                 self.session.add(user_score)
             
@@ -363,18 +504,19 @@ class PointsService:
     ) -> Dict:
         """Get stats for a user."""
         try:
-            # Get user score
-            stmt = select(UserScore).where(
+            # Points and rank are both maintained on the leaderboard row, so a
+            # single lookup on (guild_id, poll_type, user_id) is enough
+            stmt = select(*LEADERBOARD_COLUMNS).where(
                 and_(
-                    UserScore.user_id == str(user_id),
-                    UserScore.guild_id == guild_id,
-                    UserScore.poll_type == poll_type
+                    PollTypeLeaderboard.user_id == str(user_id),
+                    PollTypeLeaderboard.guild_id == guild_id,
+                    PollTypeLeaderboard.poll_type == poll_type
                 )
             )
             result = await self.session.execute(stmt)
-            user_score = result.scalar_one_or_none()
+            leaderboard_entry = result.one_or_none()
             
-            if not user_score:
+            if not leaderboard_entry:
                 return {
                     "user_id": user_id,
                     "total_points": 0,
@@ -382,22 +524,11 @@ class PointsService:
                     "rank": None
                 }
             
-            # Get user rank
-            stmt = select(PollTypeLeaderboard).where(
-                and_(
-                    PollTypeLeaderboard.user_id == str(user_id),
-                    PollTypeLeaderboard.guild_id == guild_id,
-                    PollTypeLeaderboard.poll_type == poll_type
-                )
-            )
-            result = await self.session.execute(stmt)
-            leaderboard_entry = result.scalar_one_or_none()
-            
             return {
                 "user_id": user_id,
-                "total_points": user_score.points,
-                "total_correct": user_score.total_correct,
-                "rank": leaderboard_entry.rank if leaderboard_entry else None
+                "total_points": leaderboard_entry.points,
+                "total_correct": leaderboard_entry.total_correct,
+                "rank": leaderboard_entry.rank
             }
             
         except Exception as e:
@@ -412,282 +543,74 @@ class PointsService:
     ) -> List[Dict]:
         """Get leaderboard for a guild's poll type."""
         try:
-            # Get top users by points
+            # Ranks are precomputed when the leaderboard is written, so reading
+            # the top N is an ordered range read on the stored rank rather than
+            # a sort over every user's points
             stmt = (
-                select(UserScore)
+                select(*LEADERBOARD_COLUMNS)
                 .where(
                     and_(
-                        UserScore.guild_id == guild_id,
-                        UserScore.poll_type == poll_type
+                        PollTypeLeaderboard.guild_id == guild_id,
+                        PollTypeLeaderboard.poll_type == poll_type
                     )
                 )
-                .order_by(
-                    desc(UserScore.points),
-                    desc(UserScore.total_correct)
-                )
+                .order_by(PollTypeLeaderboard.rank)
                 .limit(limit)
             )
             
-            try:
-                result = await self.session.execute(stmt)
-                scores = result.scalars().all()
-            except Exception as db_error:
-                # Handle transaction errors by rolling back
-                self.logger.error(f"Database error getting leaderboard: {db_error}", exc_info=True)
-                await self.session.rollback()
-                # Return empty results rather than failing
-                return []
+            # No rollback on failure: this read may run inside the caller's write
+            # transaction, and ending it here would silently drop those writes
+            result = await self.session.execute(stmt)
+            scores = result.all()
             
             return [
                 {
                     "user_id": score.user_id,
                     "total_points": score.points,
                     "total_correct": score.total_correct,
-                    "rank": i + 1
+                    "rank": score.rank
                 }
-                for i, score in enumerate(scores)
+                for score in scores
             ]
         except Exception as e:
             # Log the error but continue without breaking the reveal process
             self.logger.error(f"Error getting leaderboard: {e}", exc_info=True)
-            # Try to rollback the transaction to prevent cascading errors
-            try:
-                await self.session.rollback()
-            except Exception as rollback_error:
-                self.logger.error(f"Error rolling back transaction: {rollback_error}", exc_info=True)
             # Return an empty leaderboard instead of raising an error
             return []
 
     async def update_guild_leaderboard(self, guild_id: int, poll_type: str) -> None:
-        """Update rankings for a guild's poll type."""
+        """Rebuild rankings for a guild's poll type from its revealed polls."""
         try:
             self.logger.info(f"Updating leaderboard for guild {guild_id}, poll type {poll_type}")
             
-            # Instead of querying user_scores which has schema issues,
-            # we'll calculate scores directly from the votes and polls data
-            
-            # First, get all revealed polls of this type for this guild
-            polls_stmt = select(Poll).where(
-                and_(
-                    Poll.guild_id == guild_id,
-                    Poll.poll_type == poll_type,
-                    Poll.is_revealed == True
-                )
-            )
-            
-            try:
-                result = await self.session.execute(polls_stmt)
-                polls = result.scalars().all()
-                self.logger.info(f"Found {len(polls)} revealed polls for guild {guild_id}, poll type {poll_type}")
-                
-                # Log poll details for debugging
-                for poll in polls:
-                    self.logger.info(f"Poll {poll.id}: question='{poll.question}', correct_answers={poll.correct_answers}")
-            except Exception as e:
-                self.logger.error(f"Error querying polls: {e}", exc_info=True)
-                await self.session.rollback()
-                raise
-                
-            # Build user scores from votes for these polls
-            user_scores = {}
-            
-            for poll in polls:
-                # Get votes for this poll - use both Vote and UserPollSelection to ensure all votes are captured
-                self.logger.info(f"Querying votes for poll {poll.id}")
-                
-                # First get votes from the Vote table
-                votes_stmt = select(Vote).where(Vote.poll_id == poll.id)
-                result = await self.session.execute(votes_stmt)
-                votes = result.scalars().all()
-                self.logger.info(f"Found {len(votes)} votes from Vote table for poll {poll.id}")
-                
-                # Also try to get votes from UserPollSelection for legacy or alternative vote storage
-                ups_stmt = select(UserPollSelection).where(UserPollSelection.poll_id == poll.id)
-                result = await self.session.execute(ups_stmt)
-                user_selections = result.scalars().all()
-                self.logger.info(f"Found {len(user_selections)} user selections from UserPollSelection table for poll {poll.id}")
-                
-                # Process votes from Vote table
-                if votes:
-                    self.logger.info(f"Processing {len(votes)} votes from Vote table for poll {poll.id}")
-                    self._process_votes_for_leaderboard(poll, votes, user_scores)
-                    
-                # Process votes from UserPollSelection table if needed
-                if user_selections and not votes:
-                    self.logger.info(f"Processing {len(user_selections)} selections from UserPollSelection table for poll {poll.id}")
-                    self._process_selections_for_leaderboard(poll, user_selections, user_scores)
-            
-            # Convert dict to sorted list of user scores
-            scores_list = [
-                {"user_id": user_id, **score_data}
-                for user_id, score_data in user_scores.items()
-            ]
-            
-            # Sort by points (descending), then total_correct (descending)
-            scores_list.sort(key=lambda x: (-x["points"], -x["total_correct"]))
-            
-            self.logger.info(f"Calculated scores for {len(scores_list)} users")
-            for idx, score in enumerate(scores_list):
-                self.logger.info(f"User {score['user_id']}: points={score['points']}, total_correct={score['total_correct']}")
-            
-            # Delete existing leaderboard entries for this guild and poll type
-            delete_stmt = delete(PollTypeLeaderboard).where(
-                and_(
-                    PollTypeLeaderboard.guild_id == guild_id,
-                    PollTypeLeaderboard.poll_type == poll_type
+            # Replace the leaderboard inside a savepoint so a failure only undoes these writes
+            async with self.session.begin_nested():
+                # Delete existing leaderboard entries for this guild and poll type
+                delete_stmt = delete(PollTypeLeaderboard).where(
+                    and_(
+                        PollTypeLeaderboard.guild_id == guild_id,
+                        PollTypeLeaderboard.poll_type == poll_type
+                    )
                 )
-            )
-            delete_result = await self.session.execute(delete_stmt)
-            self.logger.info(f"Deleted {delete_result.rowcount} existing leaderboard entries")
-            
-            # Create new leaderboard entries
-            current_rank = 1
-            prev_points = None
-            prev_correct = None
-            
-            for i, score_data in enumerate(scores_list):
-                # Handle ties
-                if prev_points is not None and prev_correct is not None:
-                    if score_data["points"] != prev_points or score_data["total_correct"] != prev_correct:
-                        current_rank = i + 1
-                
-                user_id = score_data["user_id"]
-                points = score_data["points"]
-                total_correct = score_data["total_correct"]
-                
-                # Log the leaderboard entry we're creating
-                self.logger.info(f"Creating leaderboard entry - User: {user_id}, Guild: {guild_id}, " +
-                                f"Poll Type: {poll_type}, Points: {points}, Rank: {current_rank}")
+                delete_result = await self.session.execute(delete_stmt)
+                self.logger.info(f"Deleted {delete_result.rowcount} existing leaderboard entries")
                 
-                leaderboard_entry = PollTypeLeaderboard(
-                    guild_id=guild_id,
-                    poll_type=poll_type,
-                    user_id=user_id,
-                    points=points,
-                    total_correct=total_correct,
-                    rank=current_rank,
-                    last_updated=datetime.now(timezone.utc)
+                # Score every vote of every revealed poll and insert the ranked totals in one statement
+                insert_result = await self.session.execute(
+                    text(REBUILD_LEADERBOARD_SQL),
+                    {"guild_id": guild_id, "poll_type": poll_type}
                 )
-                self.session.add(leaderboard_entry)
-                self.logger.debug(f"Added leaderboard entry for user {user_id}, rank {current_rank}, points {points}")
-                
-                prev_points = points
-                prev_correct = total_correct
             
-            # Make sure to flush and explicitly commit the changes
-            await self.session.flush()
-            try:
-                await self.session.commit()
-                self.logger.info(f"Successfully committed leaderboard updates for guild {guild_id}, poll type {poll_type}")
-            except Exception as commit_error:
-                self.logger.error(f"Error committing leaderboard updates: {commit_error}", exc_info=True)
-                await self.session.rollback()
-                raise  # Re-raise to signal that the update failed
-            
-            # Verify the leaderboard entries were created
-            verify_stmt = select(func.count()).select_from(PollTypeLeaderboard).where(
-                and_(
-                    PollTypeLeaderboard.guild_id == guild_id,
-                    PollTypeLeaderboard.poll_type == poll_type
-                )
-            )
-            verify_result = await self.session.execute(verify_stmt)
-            entry_count = verify_result.scalar_one()
-            self.logger.info(f"Verification: {entry_count} leaderboard entries now exist for guild {guild_id}, poll type {poll_type}")
+            self.invalidate_cached_leaderboard(guild_id, poll_type)
             
-            # Verify specific entries
-            if entry_count > 0:
-                verify_entries_stmt = select(PollTypeLeaderboard).where(
-                    and_(
-                        PollTypeLeaderboard.guild_id == guild_id,
-                        PollTypeLeaderboard.poll_type == poll_type
-                    )
-                ).order_by(PollTypeLeaderboard.rank)
-                result = await self.session.execute(verify_entries_stmt)
-                entries = result.scalars().all()
-                self.logger.info(f"Verification entries: {len(entries)}")
-                for entry in entries:
-                    self.logger.info(f"Verified entry - User: {entry.user_id}, Points: {entry.points}, Rank: {entry.rank}")
+            # No commit here - the caller commits once for the whole operation
+            self.logger.info(f"Updated {insert_result.rowcount} leaderboard entries for guild {guild_id}, poll type {poll_type}")
             
         except Exception as e:
             self.logger.error(f"Error updating guild leaderboard: {e}", exc_info=True)
-            # Roll back any pending changes
-            try:
-                await self.session.rollback()
-            except Exception as rollback_error:
-                self.logger.error(f"Error rolling back transaction: {rollback_error}", exc_info=True)
             # Re-raise the exception to let the caller know there was an issue
             raise Exception(f"Failed to update guild leaderboard: {str(e)}")
 
-    def _process_votes_for_leaderboard(self, poll, votes, user_scores):
-        """Process votes from Vote model for leaderboard calculation."""
-        if poll.correct_answers:
-            correct_set = set(str(x) for x in poll.correct_answers)
-            self.logger.info(f"Poll {poll.id} correct answers: {correct_set}")
-            
-            for vote in votes:
-                user_id = vote.user_id
-                user_set = set(str(x) for x in vote.option_ids)
-                
-                # Calculate points - 1 point per correct answer
-                correct_answers = user_set & correct_set
-                points = len(correct_answers)
-                is_successful = len(correct_answers) > 0
-                
-                self.logger.info(f"Vote from user {user_id}: options={user_set}, correct={correct_answers}, points={points}, successful={is_successful}")
-                
-                # Update the user's score in our dictionary
-                if user_id not in user_scores:
-                    user_scores[user_id] = {
-                        "points": 0, 
-                        "total_correct": 0,
-                        "polls_participated": 0
-                    }
-                    
-                user_scores[user_id]["points"] += points
-                user_scores[user_id]["polls_participated"] += 1
-                if is_successful:
-                    user_scores[user_id]["total_correct"] += 1
-        else:
-            self.logger.warning(f"Poll {poll.id} has no correct answers defined, skipping point calculation")
-
-    def _process_selections_for_leaderboard(self, poll, selections, user_scores):
-        """Process selections from UserPollSelection model for leaderboard calculation."""
-        if poll.correct_answers:
-            correct_set = set(str(x) for x in poll.correct_answers)
-            self.logger.info(f"Poll {poll.id} correct answers: {correct_set}")
-            
-            for selection in selections:
-                user_id = selection.user_id
-                # Parse selections from the JSON
-                try:
-                    if selection.selections:
-                        user_set = set(str(x) for x in selection.selections)
-                        
-                        # Calculate points - 1 point per correct answer
-                        correct_answers = user_set & correct_set
-                        points = len(correct_answers)
-                        is_successful = len(correct_answers) > 0
-                        
-                        self.logger.info(f"Selection from user {user_id}: options={user_set}, correct={correct_answers}, points={points}, successful={is_successful}")
-                        
-                        # Update the user's score in our dictionary
-                        if user_id not in user_scores:
-                            user_scores[user_id] = {
-                                "points": 0, 
-                                "total_correct": 0,
-                                "polls_participated": 0
-                            }
-                            
-                        user_scores[user_id]["points"] += points
-                        user_scores[user_id]["polls_participated"] += 1
-                        if is_successful:
-                            user_scores[user_id]["total_correct"] += 1
-                except Exception as e:
-                    self.logger.error(f"Error processing selection for user {user_id}: {e}")
-        else:
-            self.logger.warning(f"Poll {poll.id} has no correct answers defined, skipping point calculation")
-
     async def get_poll(self, poll_id: int) -> Optional[Poll]:
         """Get a poll by ID."""
         stmt = select(Poll).where(Poll.id == poll_id)
@@ -696,9 +619,14 @@ class PointsService:
 
     async def get_user_poll_type_points(self, guild_id: int, poll_type: str, user_id: str):
         """Get a user's points and rank for a specific poll type."""
+        cache_key = ("user_points", guild_id, poll_type, user_id)
+        cached = _leaderboard_cache.get(cache_key, _CACHE_MISS)
+        if cached is not _CACHE_MISS:
+            return cached
+        
         try:
             # Query the database
-            stmt = select(PollTypeLeaderboard).where(
+            stmt = select(*LEADERBOARD_COLUMNS).where(
                 and_(
                     PollTypeLeaderboard.guild_id == guild_id,
                     PollTypeLeaderboard.poll_type == poll_type,
@@ -706,59 +634,46 @@ class PointsService:
                 )
             )
             result = await self.session.execute(stmt)
-            return result.scalar_one_or_none()
+            entry = result.one_or_none()
+            _leaderboard_cache.set(cache_key, entry)
+            return entry
         except Exception as e:
             self.logger.error(f"Error getting user poll type points: {e}", exc_info=True)
             raise Exception(f"Failed to get user points: {str(e)}")
     
     async def get_poll_type_leaderboard(self, guild_id: int, poll_type: str, limit: int = 10):
         """Get the leaderboard for a specific poll type."""
+        cache_key = ("leaderboard", guild_id, poll_type, limit)
+        cached = _leaderboard_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+        
         try:
             self.logger.info(f"Fetching poll_type_leaderboard for guild {guild_id}, poll type {poll_type}")
             
-            # Query the database
-            stmt = select(PollTypeLeaderboard).where(
-                and_(
-                    PollTypeLeaderboard.guild_id == guild_id,
-                    PollTypeLeaderboard.poll_type == poll_type
+            # Same rows as get_user_poll_type_points and get_user_stats, so a user's
+            # rank always matches the list shown next to it
+            stmt = (
+                select(*LEADERBOARD_COLUMNS)
+                .where(
+                    and_(
+                        PollTypeLeaderboard.guild_id == guild_id,
+                        PollTypeLeaderboard.poll_type == poll_type
+                    )
                 )
-            ).order_by(PollTypeLeaderboard.rank).limit(limit)
+                .order_by(PollTypeLeaderboard.rank)
+                .limit(limit)
+            )
             
             result = await self.session.execute(stmt)
-            entries = result.scalars().all()
+            entries = result.all()
             
             # Log the results
             self.logger.info(f"Found {len(entries)} leaderboard entries for guild {guild_id}, poll type {poll_type}")
             for entry in entries:
                 self.logger.debug(f"Leaderboard entry - User: {entry.user_id}, Points: {entry.points}, Rank: {entry.rank}")
             
-            # If no entries are found, try refreshing the leaderboard
-            if not entries:
-                self.logger.warning(f"No leaderboard entries found, attempting to refresh leaderboard")
-                try:
-                    # Force a complete refresh of the leaderboard from votes and polls
-                    self.logger.info("Forcing complete leaderboard refresh from polls and votes data")
-                    await self.update_guild_leaderboard(guild_id, poll_type)
-                    
-                    # Flush and commit the changes to ensure they're visible
-                    await self.session.flush()
-                    await self.session.commit()
-                    
-                    # Query again with fresh data
-                    self.logger.info("Re-fetching leaderboard after refresh")
-                    # Execute the query again, but with a new transaction
-                    result = await self.session.execute(stmt)
-                    entries = result.scalars().all()
-                    self.logger.info(f"After refresh: Found {len(entries)} leaderboard entries")
-                except Exception as refresh_error:
-                    self.logger.error(f"Error refreshing leaderboard: {refresh_error}", exc_info=True)
-                    # Roll back any failed changes
-                    try:
-                        await self.session.rollback()
-                    except Exception as rollback_error:
-                        self.logger.error(f"Error rolling back: {rollback_error}", exc_info=True)
-                    # Continue with empty entries
-            
+            _leaderboard_cache.set(cache_key, tuple(entries))
             return entries
         except Exception as e:
             self.logger.error(f"Error getting poll type leaderboard: {e}", exc_info=True)
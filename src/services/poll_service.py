@@ -1,27 +1,240 @@
 from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Set, Dict, Any, Union, Tuple
 import logging
+from functools import lru_cache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, and_, desc, delete, or_, func, insert, text
-from sqlalchemy.orm import selectinload
-import asyncio
-import json
+from sqlalchemy import select, update, and_, desc, delete, or_, func, insert, text, true, bindparam, cast, Integer, String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import selectinload, raiseload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy import inspect
+from sqlalchemy.engine import Row, RowMapping
+from sqlalchemy.exc import DBAPIError
 
-from src.database.models import Poll, UserPollSelection, PollStatus, PollOption, UserScore, Guild, PollMessage, Vote
-from src.database.session import SessionManager, TransactionManager
+from src.database.models import Poll, UserPollSelection, PollStatus, PollOption, UserScore, Guild, PollMessage, Vote, UIState
+from src.database.session import SessionManager
 from src.utils.exceptions import PollError, StateError, ValidationError, DatabaseError
-from src.utils.time_utils import parse_duration
 from src.utils.constants import PollType
 
 logger = logging.getLogger(__name__)
 
+ZERO_OFFSET = timedelta(0)
+
+# Toggles one option in a user's selections for an open poll in a single statement.
+# A selected option is removed; otherwise it is appended, dropping the oldest choice
+# once max_selections is reached. Returns no row when the poll is missing, inactive
+# or past its end time. FOR SHARE makes a concurrent close wait for the vote, or the
+# vote re-check the poll once the close commits, so no vote lands after a close.
+TOGGLE_SELECTION_SQL = """
+    INSERT INTO polls_user_poll_selections (poll_id, user_id, selections, created_at, updated_at)
+    SELECT p.id, :user_id, json_build_array(CAST(:selection AS text)),
+           now() AT TIME ZONE 'utc', now() AT TIME ZONE 'utc'
+    FROM polls_polls p
+    WHERE p.id = :poll_id
+      AND p.is_active = true
+      AND p.end_time > now() AT TIME ZONE 'utc'
+    FOR SHARE OF p
+    ON CONFLICT (poll_id, user_id) DO UPDATE SET
+        selections = CASE
+            WHEN polls_user_poll_selections.selections::jsonb ? CAST(:selection AS text)
+                THEN (polls_user_poll_selections.selections::jsonb - CAST(:selection AS text))::json
+            WHEN json_array_length(polls_user_poll_selections.selections) >= (
+                SELECT max_selections FROM polls_polls WHERE id = :poll_id
+            )
+                THEN ((polls_user_poll_selections.selections::jsonb - 0)
+                      || to_jsonb(CAST(:selection AS text)))::json
+            ELSE (polls_user_poll_selections.selections::jsonb
+                  || to_jsonb(CAST(:selection AS text)))::json
+        END,
+        updated_at = EXCLUDED.updated_at
+    RETURNING polls_user_poll_selections.*
+"""
+
+# One row per option of a poll, most voted first, with its vote count, whether it is a
+# correct answer and whether it has the most votes. Selections only count for polls
+# without votes, matching the scoring rules. Both store option indices (migration 023
+# converted older text selections), so an option whose text looks like another
+# option's index is never counted twice. A poll without options still yields one row
+# with NULL option columns.
+POLL_RESULTS_SQL = """
+    WITH entries AS (
+        SELECT v.option_ids AS options
+        FROM polls_votes v
+        WHERE v.poll_id = :poll_id
+        UNION ALL
+        SELECT s.selections AS options
+        FROM polls_user_poll_selections s
+        WHERE s.poll_id = :poll_id
+          AND NOT EXISTS (SELECT 1 FROM polls_votes v WHERE v.poll_id = :poll_id)
+    ),
+    counts AS (
+        SELECT o.id AS option_id, COUNT(*) AS votes
+        FROM entries e
+        CROSS JOIN LATERAL json_array_elements_text(e.options) AS sel(value)
+        JOIN polls_poll_options o
+          ON o.poll_id = :poll_id
+         AND sel.value = o.index::text
+        GROUP BY o.id
+    )
+    SELECT
+        p.is_revealed,
+        p.correct_answers,
+        (SELECT COUNT(*) FROM entries) AS total_votes,
+        o.index AS option_index,
+        o.text AS option_text,
+        COALESCE(c.votes, 0) AS votes,
+        COALESCE(p.correct_answers::jsonb ? o.index::text, false) AS is_correct,
+        COALESCE(c.votes, 0) > 0
+            AND COALESCE(c.votes, 0) = MAX(COALESCE(c.votes, 0)) OVER () AS is_winner
+    FROM polls_polls p
+    LEFT JOIN polls_poll_options o ON o.poll_id = p.id
+    LEFT JOIN counts c ON c.option_id = o.id
+    WHERE p.id = :poll_id
+    ORDER BY votes DESC, o.index
+"""
+
+# Attempts for the add_selection upsert when Postgres reports a transient conflict
+SELECTION_MAX_ATTEMPTS = 3
+
+# serialization_failure and deadlock_detected
+RETRYABLE_SQLSTATES = frozenset({"40001", "40P01"})
+
+def _is_retryable_db_error(error: DBAPIError) -> bool:
+    """Whether the statement can be retried as-is after a transient conflict."""
+    sqlstate = getattr(error.orig, "sqlstate", None) or getattr(error.orig, "pgcode", None)
+    return sqlstate in RETRYABLE_SQLSTATES
+
+# Upper bound on the poll messages returned by one get_poll_messages call
+POLL_MESSAGES_PAGE_SIZE = 100
+
+# Columns the active poll sweeps read; use get_poll for the full object
+ACTIVE_POLL_COLUMNS = (Poll.id, Poll.guild_id, Poll.poll_type, Poll.end_time, Poll.channel_id)
+
+# Hot lookups are built once with bind parameters so each call skips statement
+# construction and cache-key generation; asyncpg reuses the prepared statement per connection
+_GET_POLL_STMT = (
+    select(Poll)
+    .options(selectinload(Poll.options), raiseload('*'))
+    .where(Poll.id == bindparam("poll_id"))
+)
+
+_GET_USER_SELECTION_STMT = select(UserPollSelection).where(
+    UserPollSelection.poll_id == bindparam("poll_id"),
+    UserPollSelection.user_id == bindparam("user_id")
+)
+
+# For backward compatibility, check both fields (status and is_active).
+# The poll message is joined in so the lookup takes one round trip.
+_GET_ACTIVE_POLL_STMT = (
+    select(Poll, PollMessage.channel_id, PollMessage.message_id)
+    .outerjoin(
+        PollMessage,
+        and_(
+            PollMessage.poll_id == Poll.id,
+            PollMessage.message_type == "poll"
+        )
+    )
+    .where(Poll.poll_type == bindparam("poll_type"))
+    .where(
+        or_(
+            Poll.status == PollStatus.OPEN,
+            Poll.is_active == True
+        )
+    )
+    .options(selectinload(Poll.options), raiseload('*'))
+    .limit(1)
+)
+
+_GET_LATEST_POLL_OF_TYPE_STMT = (
+    select(Poll)
+    .options(raiseload('*'))
+    .where(Poll.guild_id == bindparam("guild_id"))
+    .where(Poll.poll_type == bindparam("poll_type"))
+    .order_by(Poll.created_at.desc())
+    .limit(1)
+)
+
+_GET_LATEST_OPEN_POLL_OF_TYPE_STMT = _GET_LATEST_POLL_OF_TYPE_STMT.where(Poll.is_active == True)
+
+_TOGGLE_SELECTION_STMT = select(UserPollSelection).from_statement(
+    text(TOGGLE_SELECTION_SQL)
+).execution_options(populate_existing=True)
+
+_POLL_RESULTS_STMT = text(POLL_RESULTS_SQL)
+
+# Upsert with only the columns that exist in the database, using direct SQL to
+# avoid any issues with option_index; replaces any earlier selections in place.
+# Indices are bound as a text[] that Postgres turns into the JSON array (stored
+# as strings like the ORM-validated columns), and timestamps come from the
+# server in UTC to match the naive UTC values TZDateTime writes.
+_REGISTER_VOTE_STMT = text("""
+    INSERT INTO polls_user_poll_selections 
+        (poll_id, user_id, selections, created_at, updated_at) 
+    VALUES 
+        (:poll_id, :user_id, array_to_json(:selections), NOW() AT TIME ZONE 'UTC', NOW() AT TIME ZONE 'UTC')
+    ON CONFLICT (poll_id, user_id) DO UPDATE SET
+        selections = EXCLUDED.selections,
+        updated_at = EXCLUDED.updated_at
+""").bindparams(bindparam("selections", type_=postgresql.ARRAY(String)))
+
+_UPDATE_POLL_END_TIME_STMT = text(
+    "UPDATE polls_polls SET end_time = :end_time WHERE id = :poll_id"
+)
+
+@lru_cache(maxsize=64)
+def _parse_duration_cached(duration: str) -> timedelta:
+    """Parse a duration string such as '30m', '24h' or '5d'; raises ValueError if invalid."""
+    value = int(duration[:-1])
+    unit = duration[-1].lower()
+    
+    if unit == 'm':
+        return timedelta(minutes=value)
+    elif unit == 'h':
+        return timedelta(hours=value)
+    elif unit == 'd':
+        return timedelta(days=value)
+    raise ValueError(f"Invalid duration unit: {unit}")
+
 class PollService:
+    """Poll operations on a caller-owned session.
+
+    Raw SQL writes (register_vote, register_poll_message, update_poll_end_time)
+    execute immediately and do not flush or commit; callers commit once per
+    logical operation and flush themselves only if they need pending ORM
+    changes visible before then.
+    """
+
     def __init__(self, db_session: AsyncSession):
         self.db = db_session
-        self.transaction_manager = TransactionManager(db_session)
         self.logger = logging.getLogger(__name__)
     
+    def _now(self) -> datetime:
+        """Current time in UTC; read once per method and reused."""
+        return datetime.now(timezone.utc)
+    
+    @staticmethod
+    def _active_polls_query():
+        """Active polls joined with their latest poll message, so callers need no per-poll lookup."""
+        latest_message = (
+            select(
+                PollMessage.channel_id.label("message_channel_id"),
+                PollMessage.message_id
+            )
+            .where(
+                PollMessage.poll_id == Poll.id,
+                PollMessage.message_type == "poll"
+            )
+            .order_by(desc(PollMessage.created_at))
+            .limit(1)
+            .lateral("latest_message")
+        )
+        return (
+            select(*ACTIVE_POLL_COLUMNS, latest_message.c.message_channel_id, latest_message.c.message_id)
+            .select_from(Poll)
+            .outerjoin(latest_message, true())
+            .where(Poll.is_active == True)
+        )
+    
     def _make_db_safe_datetime(self, dt):
         """Convert timezone-aware datetime to naive UTC datetime for database storage."""
         if dt is None:
@@ -31,17 +244,13 @@ class PollService:
         if dt.tzinfo is None:
             return dt
             
+        # Already UTC (the usual case): just drop the timezone info
+        if dt.tzinfo is timezone.utc or dt.utcoffset() == ZERO_OFFSET:
+            return dt.replace(tzinfo=None)
+            
         # Convert to UTC and remove timezone info
         return dt.astimezone(timezone.utc).replace(tzinfo=None)
     
-    def _ensure_timezone_aware(self, dt):
-        """Ensure a datetime object has timezone information (UTC)."""
-        if dt is None:
-            return None
-        if dt.tzinfo is None:
-            return dt.replace(tzinfo=timezone.utc)
-        return dt
-
     async def create_poll(
         self,
         question: str,
@@ -76,64 +285,56 @@ class PollService:
         """
         try:
             # Calculate end time from duration (with timezone awareness)
-            end_time = datetime.now(timezone.utc) + self._parse_duration(duration)
-            
-            # Create the poll - TZDateTime will handle timezone conversion automatically
-            poll = Poll(
-                question=question,
-                creator_id=int(creator_id),
-                guild_id=guild_id,
-                poll_type=poll_type,
-                max_selections=max_selections,
-                end_time=end_time,  # TZDateTime handles conversion automatically
-                is_active=True,
-                is_revealed=False
-            )
-            self.db.add(poll)
-            await self.db.flush()  # Get the poll ID
-            
-            # Add options
-            for i, option_text in enumerate(options):
-                option = PollOption(
-                    poll_id=poll.id,
-                    text=option_text,
-                    index=i
+            end_time = self._now() + self._parse_duration(duration)
+            
+            # Create the poll - TZDateTime will handle timezone conversion automatically.
+            # RETURNING brings back the id and defaults without a follow-up SELECT.
+            poll = await self.db.scalar(
+                insert(Poll)
+                .values(
+                    question=question,
+                    creator_id=int(creator_id),
+                    guild_id=guild_id,
+                    poll_type=poll_type,
+                    max_selections=max_selections,
+                    end_time=end_time,  # TZDateTime handles conversion automatically
+                    is_active=True,
+                    is_revealed=False
                 )
-                self.db.add(option)
+                .returning(Poll)
+            )
             
-            # Commit changes
-            await self.db.flush()
+            # Add options with a single executemany INSERT that returns the new rows
+            poll_options = []
+            if options:
+                result = await self.db.scalars(
+                    insert(PollOption).returning(PollOption),
+                    [
+                        {"poll_id": poll.id, "text": option_text, "index": i}
+                        for i, option_text in enumerate(options)
+                    ]
+                )
+                poll_options = sorted(result.all(), key=lambda option: option.index)
             
-            # Refresh the poll to get options
-            await self.db.refresh(poll)
+            # Attach the inserted options to the poll without loading them again
+            set_committed_value(poll, "options", poll_options)
             
             # TZDateTime should ensure poll.end_time now has timezone info
             return poll
         except Exception as e:
-            self.logger.error(f"Error creating poll: {e}", exc_info=True)
+            self.logger.error("Error creating poll: %s", e, exc_info=True)
             raise DatabaseError(f"Failed to create poll: {str(e)}")
 
     def _parse_duration(self, duration: str) -> timedelta:
         """Parse duration string into timedelta."""
+        # Handle case where the duration might be empty or None
+        if not duration:
+            # Default: 5 days
+            return timedelta(days=5)
         try:
-            # Handle case where the duration might be empty or None
-            if not duration:
-                # Default: 5 days
-                return timedelta(days=5)
-            
-            value = int(duration[:-1])
-            unit = duration[-1].lower()
-            
-            if unit == 'm':
-                return timedelta(minutes=value)
-            elif unit == 'h':
-                return timedelta(hours=value)
-            elif unit == 'd':
-                return timedelta(days=value)
-            else:
-                raise ValueError(f"Invalid duration unit: {unit}")
+            return _parse_duration_cached(duration)
         except Exception as e:
-            self.logger.error(f"Error parsing duration '{duration}': {e}")
+            self.logger.error("Error parsing duration '%s': %s", duration, e)
             # Default to 5 days on error rather than raising an exception
             return timedelta(days=5)
 
@@ -145,147 +346,105 @@ class PollService:
     ) -> UserPollSelection:
         """Add or update a user's selection for a poll."""
         try:
-            self.logger.debug(f"Adding selection for poll {poll_id}, user {user_id}, selection {selection}")
+            self.logger.debug("Adding selection for poll %s, user %s, selection %s", poll_id, user_id, selection)
             
-            # Get poll with retry logic
-            poll = None
-            for attempt in range(3):
-                try:
-                    poll = await self.get_poll(poll_id)
-                    if poll:
-                        break
-                    await asyncio.sleep(0.5)
-                except Exception as e:
-                    self.logger.debug(f"Attempt {attempt + 1} to get poll failed: {e}")
-                    if attempt == 2:
-                        raise
-                    continue
-                    
-            if not poll:
-                self.logger.warning(f"Poll {poll_id} not found")
-                raise PollError("Poll not found")
-                
-            # Check if poll is open for voting
-            now = datetime.now(timezone.utc)
-            poll_end_time = self._ensure_timezone_aware(poll.end_time)
+            # Validate the poll and toggle the selection in a single upsert
+            stmt = _TOGGLE_SELECTION_STMT
+            params = {"poll_id": poll_id, "user_id": user_id, "selection": selection}
             
-            if now > poll_end_time:
-                self.logger.debug(f"Poll {poll_id} has ended")
-                raise PollError("Poll has ended")
-                
-            if not poll.is_active:
-                self.logger.debug(f"Poll {poll_id} is not active")
-                raise PollError("Poll is not active")
-
-            # Get user's existing selection with retry logic
-            user_selection = None
-            for attempt in range(3):
+            # Retry only the savepoint on serialization failures and deadlocks, keeping
+            # the rest of the session intact
+            for attempt in range(SELECTION_MAX_ATTEMPTS):
                 try:
-                    user_selection = await self._get_user_selection(poll_id, user_id)
+                    async with self.db.begin_nested():
+                        result = await self.db.execute(stmt, params)
+                        user_selection = result.scalar_one_or_none()
                     break
-                except Exception as e:
-                    self.logger.debug(f"Attempt {attempt + 1} to get user selection failed: {e}")
-                    if attempt == 2:
+                except DBAPIError as e:
+                    if not _is_retryable_db_error(e) or attempt == SELECTION_MAX_ATTEMPTS - 1:
                         raise
-                    await asyncio.sleep(0.5)
-                    continue
+                    self.logger.warning("Selection upsert for poll %s conflicted, retrying (attempt %s)", poll_id, attempt + 1)
             
-            if user_selection:
-                self.logger.debug(f"Existing selections: {user_selection.selections}")
-                current_selections = set(user_selection.selections)
-                if selection in current_selections:
-                    self.logger.debug(f"Removing selection {selection}")
-                    current_selections.remove(selection)
-                else:
-                    if len(current_selections) >= poll.max_selections:
-                        removed = next(iter(current_selections))
-                        self.logger.debug(f"Max selections reached, removing {removed}")
-                        current_selections.remove(removed)
-                    self.logger.debug(f"Adding selection {selection}")
-                    current_selections.add(selection)
-                user_selection.selections = list(current_selections)
-                self.logger.debug(f"Updated selections: {user_selection.selections}")
-            else:
-                self.logger.debug("Creating new user selection")
-                user_selection = UserPollSelection(
-                    poll_id=poll_id,
-                    user_id=user_id,
-                    selections=[selection]
-                )
-                self.db.add(user_selection)
-                self.logger.debug("Added new selection to session")
-
-            # Commit changes with retry logic
-            for attempt in range(3):
-                try:
-                    await self.db.commit()
-                    await self.db.refresh(user_selection)
-                    self.logger.debug("Changes committed")
-                    break
-                except Exception as e:
-                    self.logger.debug(f"Attempt {attempt + 1} to commit changes failed: {e}")
-                    await self.db.rollback()
-                    if attempt == 2:
-                        raise
-                    await asyncio.sleep(0.5)
-                    continue
+            if not user_selection:
+                # Nothing was written, so the poll is missing, closed or past its end time
+                raise PollError(await self._selection_rejection_reason(poll_id))
             
+            await self.db.commit()
+            self.logger.debug("Updated selections: %s", user_selection.selections)
             return user_selection
             
         except PollError:
             # Re-raise PollError without logging as error
             raise
         except Exception as e:
-            self.logger.error(f"Error adding selection: {e}", exc_info=True)
+            self.logger.error("Error adding selection: %s", e, exc_info=True)
+            await self.db.rollback()
             raise PollError("Failed to add selection")
 
+    async def _selection_rejection_reason(self, poll_id: int) -> str:
+        """Explain why add_selection could not record a vote for a poll."""
+        result = await self.db.execute(
+            select(Poll.is_active, Poll.end_time).where(Poll.id == poll_id)
+        )
+        poll = result.one_or_none()
+        if not poll:
+            self.logger.warning("Poll %s not found", poll_id)
+            return "Poll not found"
+        if not poll.is_active:
+            self.logger.debug("Poll %s is not active", poll_id)
+            return "Poll is not active"
+        self.logger.debug("Poll %s has ended", poll_id)
+        return "Poll has ended"
+
     async def get_poll_with_refresh(self, poll_id: int) -> Optional[Poll]:
         """Get a poll by ID and refresh its state."""
         try:
-            # Get poll with all relationships loaded
+            # Views render options and selections; anything else must be loaded explicitly
             stmt = select(Poll).where(Poll.id == poll_id).options(
                 selectinload(Poll.options),
                 selectinload(Poll.selections),
-                selectinload(Poll.messages),
-                selectinload(Poll.ui_states)
+                raiseload('*')
             )
             result = await self.db.execute(stmt)
             poll = result.scalar_one_or_none()
 
             if poll:
                 # Refresh poll state
-                now = datetime.utcnow()
+                now = self._now()
                 
                 # DO NOT update active status based on end time
                 # This was causing issues with the poll status management
                 # poll.is_active = poll.end_time > now and not poll.is_revealed
                 
-                # Check for orphaned UI states (older than 24 hours)
-                for ui_state in poll.ui_states:
-                    if now - ui_state.last_interaction > timedelta(hours=24):
-                        self.db.delete(ui_state)
-                
-                # Check for orphaned messages
-                for message in poll.messages:
-                    try:
-                        # Only delete if we can verify the message doesn't exist
-                        if not message.is_valid:
-                            self.db.delete(message)
-                    except Exception as e:
-                        logger.warning(f"Error checking message validity: {e}")
-                        continue
-                
                 try:
+                    # Remove orphaned UI states (older than 24 hours) without loading them
+                    await self.db.execute(
+                        delete(UIState).where(
+                            UIState.poll_id == poll_id,
+                            UIState.last_interaction < now - timedelta(hours=24)
+                        )
+                    )
+                    # Remove messages that can no longer be resolved (see PollMessage.is_valid)
+                    await self.db.execute(
+                        delete(PollMessage).where(
+                            PollMessage.poll_id == poll_id,
+                            or_(
+                                PollMessage.message_id.is_(None),
+                                PollMessage.message_id == 0,
+                                PollMessage.channel_id.is_(None),
+                                PollMessage.channel_id == 0
+                            )
+                        )
+                    )
                     await self.db.commit()
-                    await self.db.refresh(poll)
                 except Exception as e:
-                    logger.error(f"Error committing state refresh: {e}")
+                    logger.error("Error committing state refresh: %s", e)
                     await self.db.rollback()
                 
             return poll
             
         except Exception as e:
-            logger.error(f"Error getting poll with refresh: {e}", exc_info=True)
+            logger.error("Error getting poll with refresh: %s", e, exc_info=True)
             await self.db.rollback()
             return None
 
@@ -314,7 +473,7 @@ class PollService:
             if new_status == PollStatus.CLOSED:
                 poll.is_active = False
                 # Set end_time to current time if closing now
-                now = datetime.now(timezone.utc)
+                now = self._now()
                 # TZDateTime will handle timezone conversion
                 poll.end_time = now
             elif new_status == PollStatus.REVEALED:
@@ -331,7 +490,7 @@ class PollService:
             result = await _update()
             return result
         except Exception as e:
-            self.logger.error(f"Error updating poll state: {e}", exc_info=True)
+            self.logger.error("Error updating poll state: %s", e, exc_info=True)
             raise PollError(f"Failed to update poll state: {str(e)}")
 
     async def close_poll(self, poll_id: int) -> Poll:
@@ -363,7 +522,7 @@ class PollService:
             poll.is_active = False
             
             # Set end_time to current time if it hasn't ended yet
-            now = datetime.now(timezone.utc)
+            now = self._now()
             if poll.end_time > now:
                 # TZDateTime will handle timezone conversion
                 poll.end_time = now
@@ -376,7 +535,7 @@ class PollService:
             # Re-raise specific poll errors
             raise
         except Exception as e:
-            self.logger.error(f"Error closing poll: {e}", exc_info=True)
+            self.logger.error("Error closing poll: %s", e, exc_info=True)
             raise PollError(f"Failed to close poll: {str(e)}")
 
     async def reveal_poll(self, poll_id: int, correct_answers: List[str]) -> Poll:
@@ -411,7 +570,7 @@ class PollService:
                 poll.is_active = False
                 
                 # Set end_time to current time if it hasn't ended yet
-                now = datetime.now(timezone.utc)
+                now = self._now()
                 if poll.end_time > now:
                     # TZDateTime will handle timezone conversion
                     poll.end_time = now
@@ -428,13 +587,12 @@ class PollService:
             # Re-raise specific poll errors
             raise
         except Exception as e:
-            self.logger.error(f"Error revealing poll: {e}", exc_info=True)
+            self.logger.error("Error revealing poll: %s", e, exc_info=True)
             raise PollError(f"Failed to reveal poll: {str(e)}")
 
     async def get_poll(self, poll_id: int) -> Optional[Poll]:
         """Get a poll by ID with its options loaded."""
-        stmt = select(Poll).options(selectinload(Poll.options)).where(Poll.id == poll_id)
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(_GET_POLL_STMT, {"poll_id": poll_id})
         return result.scalar_one_or_none()
 
     async def _get_user_selection(
@@ -443,42 +601,64 @@ class PollService:
         user_id: str
     ) -> Optional[UserPollSelection]:
         """Get a user's selection for a poll."""
-        query = select(UserPollSelection).where(
-            UserPollSelection.poll_id == poll_id,
-            UserPollSelection.user_id == user_id
+        result = await self.db.execute(
+            _GET_USER_SELECTION_STMT,
+            {"poll_id": poll_id, "user_id": user_id}
         )
-        result = await self.db.execute(query)
         return result.scalar_one_or_none()
     
-    async def get_expired_polls(self) -> List[Poll]:
-        """Get all expired but still open polls."""
+    async def get_expired_polls(self) -> List[Row]:
+        """Get all expired but still open polls as (id, end_time, guild_id, poll_type) rows."""
+        try:
+            now = self._now()
+            
+            # Plain rows skip ORM hydration; callers only need the identifying columns.
+            # Served by the partial index ix_polls_expired (migration 019), which must
+            # keep matching _expired_poll_conditions.
+            query = select(Poll.id, Poll.end_time, Poll.guild_id, Poll.poll_type).where(
+                *self._expired_poll_conditions(now)
+            )
+            result = await self.db.execute(query)
+            return result.all()
+        except Exception as e:
+            self.logger.error("Error getting expired polls: %s", e, exc_info=True)
+            raise PollError("Failed to get expired polls")
+
+    async def get_expired_polls_full(self) -> List[Poll]:
+        """Get all expired but still open polls as Poll objects."""
         try:
-            now = datetime.now(timezone.utc)
+            now = self._now()
             
             # With TZDateTime, we can use the ORM directly again
-            query = select(Poll).where(
-                and_(
-                    Poll.is_active == True,
-                    Poll.is_revealed == False,
-                    Poll.end_time <= now
-                )
+            query = select(Poll).options(raiseload('*')).where(
+                *self._expired_poll_conditions(now)
             )
             result = await self.db.execute(query)
             polls = result.scalars().all()
             
             return polls
         except Exception as e:
-            self.logger.error(f"Error getting expired polls: {e}", exc_info=True)
+            self.logger.error("Error getting expired polls: %s", e, exc_info=True)
             raise PollError("Failed to get expired polls")
 
-    async def get_latest_poll(self, include_closed: bool = False) -> Optional[Poll]:
+    @staticmethod
+    def _expired_poll_conditions(now: datetime) -> tuple:
+        """Filter for polls that are still open but past their end time."""
+        return (
+            Poll.is_active == True,
+            Poll.is_revealed == False,
+            Poll.end_time <= now
+        )
+
+    async def get_latest_poll(self, include_closed: bool = False, load_options: bool = False) -> Optional[Poll]:
         """Get the most recent poll.
         
         Args:
             include_closed: If True, also include recently closed polls
+            load_options: If True, also load the poll's options
         """
         try:
-            logger.debug(f"Getting latest poll (include_closed={include_closed})")
+            logger.debug("Getting latest poll (include_closed=%s)", include_closed)
             
             conditions = []
             if not include_closed:
@@ -486,22 +666,24 @@ class PollService:
             
             stmt = (
                 select(Poll)
-                .options(selectinload(Poll.options))
                 .where(*conditions)
                 .order_by(desc(Poll.created_at))
                 .limit(1)
             )
-            logger.debug(f"Query: {stmt}")
+            if load_options:
+                stmt = stmt.options(selectinload(Poll.options))
+            stmt = stmt.options(raiseload('*'))
+            logger.debug("Query: %s", stmt)
             result = await self.db.execute(stmt)
             poll = result.scalar_one_or_none()
             
             if poll:
-                logger.debug(f"Found poll ID: {poll.id}, created at: {poll.created_at}, is_active: {poll.is_active}")
+                logger.debug("Found poll ID: %s, created at: %s, is_active: %s", poll.id, poll.created_at, poll.is_active)
             else:
                 logger.debug("No poll found")
             return poll
         except Exception as e:
-            logger.error(f"Error getting latest poll: {e}", exc_info=True)
+            logger.error("Error getting latest poll: %s", e, exc_info=True)
             raise
         
     async def update_user_selection(
@@ -537,7 +719,7 @@ class PollService:
             return user_selection
 
         except Exception as e:
-            logger.error(f"Error updating user selection: {e}")
+            logger.error("Error updating user selection: %s", e)
             await self.db.rollback()
             raise PollError("Failed to update user selection")
 
@@ -554,38 +736,28 @@ class PollService:
             The active poll or None if no active poll exists
         """
         try:
-            # For backward compatibility, check both fields (status and is_active)
-            stmt = (
-                select(Poll)
-                .where(Poll.poll_type == poll_type)
-                .where(
-                    or_(
-                        Poll.status == PollStatus.OPEN,
-                        Poll.is_active == True
-                    )
-                )
-                .options(selectinload(Poll.options))
-            )
-            result = await self.db.execute(stmt)
-            poll = result.scalars().first()
+            result = await self.db.execute(_GET_ACTIVE_POLL_STMT, {"poll_type": poll_type})
+            row = result.first()
             
-            if not poll:
+            if not row:
                 return None
             
-            # Get poll message info
-            message_info = await self.get_poll_message(poll.id)
-            if message_info:
-                poll.channel_id, poll.message_id = message_info
+            # Attach poll message info, falling back to the legacy Poll.channel_id
+            poll, channel_id, message_id = row
+            if message_id is not None:
+                poll.channel_id, poll.message_id = channel_id, message_id
+            elif poll.channel_id:
+                poll.channel_id, poll.message_id = int(poll.channel_id), None
             
             return poll
         except Exception as e:
-            self.logger.error(f"Error getting active poll: {e}", exc_info=True)
+            self.logger.error("Error getting active poll: %s", e, exc_info=True)
             raise DatabaseError(f"Failed to get active poll: {str(e)}")
 
     async def close_all_polls_except(self, except_poll_id: Optional[int] = None) -> None:
         """Close all active polls except the specified one."""
         try:
-            logger.debug(f"Closing all polls except ID: {except_poll_id}")
+            logger.debug("Closing all polls except ID: %s", except_poll_id)
             stmt = (
                 update(Poll)
                 .where(
@@ -596,12 +768,12 @@ class PollService:
                 )
                 .values(is_active=False)
             )
-            logger.debug(f"Query: {stmt}")
+            logger.debug("Query: %s", stmt)
             await self.db.execute(stmt)
             await self.db.commit()
             logger.debug("Successfully closed old polls")
         except Exception as e:
-            logger.error(f"Error closing old polls: {e}", exc_info=True)
+            logger.error("Error closing old polls: %s", e, exc_info=True)
             await self.db.rollback()
             raise
 
@@ -610,20 +782,20 @@ class PollService:
         try:
             stmt = (
                 select(Poll)
-                .options(selectinload(Poll.options))
+                .options(selectinload(Poll.options), raiseload('*'))
                 .where(
                     and_(
                         Poll.is_active == True,
-                        Poll.end_time > datetime.utcnow()
+                        Poll.end_time > self._now()
                     )
                 )
             )
             result = await self.db.execute(stmt)
             polls = result.scalars().all()
-            logger.debug(f"Found {len(polls)} active polls")
+            logger.debug("Found %s active polls", len(polls))
             return polls
         except Exception as e:
-            logger.error(f"Error getting active polls: {e}", exc_info=True)
+            logger.error("Error getting active polls: %s", e, exc_info=True)
             raise PollError("Failed to get active polls")
 
     async def get_latest_poll_in_channel(
@@ -632,7 +804,7 @@ class PollService:
         include_closed: bool = False
     ) -> Optional[Poll]:
         """Get the latest poll in a channel."""
-        stmt = select(Poll).where(Poll.channel_id == channel_id)
+        stmt = select(Poll).options(raiseload('*')).where(Poll.channel_id == channel_id)
         
         if not include_closed:
             stmt = stmt.where(Poll.status == PollStatus.OPEN)
@@ -643,21 +815,25 @@ class PollService:
 
     async def close_all_polls_in_channel(self, channel_id: int) -> None:
         """Close all active polls in a channel."""
-        logger.debug(f"Closing all polls in channel {channel_id}")
-        stmt = select(Poll).where(
-            and_(
-                Poll.channel_id == channel_id,
-                Poll.is_active == True
+        try:
+            logger.debug("Closing all polls in channel %s", channel_id)
+            stmt = (
+                update(Poll)
+                .where(
+                    and_(
+                        Poll.channel_id == channel_id,
+                        Poll.is_active == True
+                    )
+                )
+                .values(is_active=False, end_time=self._now())
             )
-        )
-        result = await self.db.execute(stmt)
-        polls = result.scalars().all()
-        logger.debug(f"Found {len(polls)} active polls to close")
-        
-        for poll in polls:
-            poll.is_active = False
-            poll.end_time = datetime.utcnow()
-            logger.debug(f"Closed poll {poll.id}")
+            result = await self.db.execute(stmt)
+            await self.db.commit()
+            logger.debug("Closed %s polls in channel %s", result.rowcount, channel_id)
+        except Exception as e:
+            self.logger.error("Error closing polls in channel: %s", e, exc_info=True)
+            await self.db.rollback()
+            raise PollError(f"Failed to close polls: {str(e)}")
 
     async def record_vote(
         self,
@@ -676,7 +852,12 @@ class PollService:
         if len(selected_options) > poll.max_selections:
             raise PollError(f"Maximum {poll.max_selections} selections allowed")
             
-        if not all(option in poll.options for option in selected_options):
+        if len(set(selected_options)) != len(selected_options):
+            raise PollError("Duplicate option selected")
+            
+        # poll.options holds PollOption rows; compare against their texts
+        option_texts = frozenset(option.text for option in poll.options)
+        if not all(option in option_texts for option in selected_options):
             raise PollError("Invalid option selected")
         
         # Create or update user score
@@ -692,7 +873,7 @@ class PollService:
         
         if user_score:
             user_score.selected_options = selected_options
-            user_score.last_updated = datetime.utcnow()
+            user_score.last_updated = self._now()
         else:
             user_score = UserScore(
                 poll_id=poll_id,
@@ -703,25 +884,32 @@ class PollService:
             self.db.add(user_score)
 
     async def get_poll_results(self, poll_id: int) -> dict:
-        """Get the results of a poll."""
-        poll = await self.get_poll(poll_id)
-        if not poll:
+        """Get the results of a poll, computed in a single query."""
+        result = await self.db.execute(_POLL_RESULTS_STMT, {"poll_id": poll_id})
+        rows = result.mappings().all()
+        if not rows:
             raise PollError("Poll not found")
         
-        stmt = select(UserScore).where(UserScore.poll_id == poll_id)
-        result = await self.db.execute(stmt)
-        scores = result.scalars().all()
-        
-        # Count votes for each option
-        vote_counts = {option: 0 for option in poll.options}
-        for score in scores:
-            for option in score.selected_options:
-                vote_counts[option] += 1
+        is_revealed = rows[0]["is_revealed"]
+        options = [
+            {
+                "index": row["option_index"],
+                "text": row["option_text"],
+                "votes": row["votes"],
+                # Correct answers stay hidden until the poll is revealed
+                "is_correct": is_revealed and row["is_correct"],
+                "is_winner": row["is_winner"]
+            }
+            for row in rows
+            if row["option_index"] is not None
+        ]
                 
         return {
-            "total_votes": len(scores),
-            "vote_counts": vote_counts,
-            "correct_answers": poll.correct_answers if poll.status == PollStatus.REVEALED else None
+            "total_votes": rows[0]["total_votes"],
+            # Keyed like Vote.option_ids and correct_answers: the option index as a string
+            "vote_counts": {str(option["index"]): option["votes"] for option in options},
+            "options": options,
+            "correct_answers": rows[0]["correct_answers"] if is_revealed else None
         }
 
     async def close_all_polls_of_type(self, guild_id: int, poll_type: str) -> None:
@@ -741,7 +929,7 @@ class PollService:
             await self.db.execute(stmt)
             await self.db.commit()
         except Exception as e:
-            self.logger.error(f"Error closing polls: {e}", exc_info=True)
+            self.logger.error("Error closing polls: %s", e, exc_info=True)
             await self.db.rollback()
             raise PollError(f"Failed to close polls: {str(e)}")
 
@@ -763,27 +951,12 @@ class PollService:
             The latest poll of the given type, or None if not found
         """
         try:
-            stmt = (
-                select(Poll)
-                .where(Poll.guild_id == guild_id)
-                .where(Poll.poll_type == poll_type)
-            )
-            
-            if not include_closed:
-                stmt = stmt.where(Poll.is_active == True)
-            
-            stmt = stmt.order_by(Poll.created_at.desc()).limit(1)
-            
-            result = await self.db.execute(stmt)
-            poll = result.scalars().first()
-            
-            # Ensure poll end_time has timezone information
-            if poll and poll.end_time and poll.end_time.tzinfo is None:
-                poll.end_time = poll.end_time.replace(tzinfo=timezone.utc)
-            
-            return poll
+            stmt = _GET_LATEST_POLL_OF_TYPE_STMT if include_closed else _GET_LATEST_OPEN_POLL_OF_TYPE_STMT
+            result = await self.db.execute(stmt, {"guild_id": guild_id, "poll_type": poll_type})
+            # TZDateTime already returns a timezone-aware end_time
+            return result.scalars().first()
         except Exception as e:
-            self.logger.error(f"Error getting latest poll of type {poll_type}: {e}", exc_info=True)
+            self.logger.error("Error getting latest poll of type %s: %s", poll_type, e, exc_info=True)
             return None
 
     async def get_latest_poll_of_type_any_status(
@@ -811,95 +984,93 @@ class PollService:
             )
             
             result = await self.db.execute(stmt)
-            poll = result.scalars().first()
-            
-            # Ensure poll end_time has timezone information
-            if poll and poll.end_time and poll.end_time.tzinfo is None:
-                poll.end_time = poll.end_time.replace(tzinfo=timezone.utc)
-            
-            return poll
+            # TZDateTime already returns a timezone-aware end_time
+            return result.scalars().first()
         except Exception as e:
-            self.logger.error(f"Error getting latest poll of type {poll_type} (any status): {e}", exc_info=True)
+            self.logger.error("Error getting latest poll of type %s (any status): %s", poll_type, e, exc_info=True)
             return None
 
-    async def get_active_polls_by_type(self, guild_id: int, poll_type: str) -> List[Poll]:
-        """Get all active polls for a specific poll type in a guild."""
+    async def get_active_polls_by_type(self, guild_id: int, poll_type: str) -> List[Row]:
+        """Get all active polls for a specific poll type in a guild as lightweight rows."""
         try:
             # Query the database
-            stmt = select(Poll).where(
-                and_(
-                    Poll.guild_id == guild_id,
-                    Poll.poll_type == poll_type,
-                    Poll.is_active == True
-                )
+            stmt = self._active_polls_query().where(
+                Poll.guild_id == guild_id,
+                Poll.poll_type == poll_type
             )
             result = await self.db.execute(stmt)
-            polls = result.scalars().all()
+            polls = result.all()
             
             return polls
         except Exception as e:
-            self.logger.error(f"Error getting active polls by type: {e}", exc_info=True)
+            self.logger.error("Error getting active polls by type: %s", e, exc_info=True)
             raise DatabaseError(f"Failed to get active polls: {str(e)}")
             
     async def register_poll_message(self, poll_id: int, channel_id: int, message_id: int) -> None:
         """Register a message as a poll message for updating."""
         try:
-            # Check if the message is already registered
-            stmt = select(PollMessage).where(
-                and_(
-                    PollMessage.poll_id == poll_id,
-                    PollMessage.channel_id == channel_id,
-                    PollMessage.message_id == message_id
+            # Create new poll message record; already registered messages are skipped
+            stmt = (
+                postgresql.insert(PollMessage)
+                .values(
+                    poll_id=poll_id,
+                    channel_id=channel_id,
+                    message_id=message_id
+                )
+                .on_conflict_do_nothing(
+                    index_elements=["poll_id", "channel_id", "message_id"]
                 )
             )
-            result = await self.db.execute(stmt)
-            existing = result.scalar_one_or_none()
-            
-            if existing:
-                return
-                
-            # Create new poll message record
-            poll_message = PollMessage(
-                poll_id=poll_id,
-                channel_id=channel_id,
-                message_id=message_id
-            )
-            
-            self.db.add(poll_message)
-            await self.db.flush()
+            await self.db.execute(stmt)
             
         except Exception as e:
-            self.logger.error(f"Error registering poll message: {e}", exc_info=True)
+            self.logger.error("Error registering poll message: %s", e, exc_info=True)
             raise DatabaseError(f"Failed to register poll message: {str(e)}")
             
-    async def get_poll_messages(self, poll_id: int) -> List:
-        """Get all messages associated with a poll."""
+    async def get_poll_messages(
+        self,
+        poll_id: int,
+        limit: int = POLL_MESSAGES_PAGE_SIZE,
+        offset: int = 0
+    ) -> List[Row]:
+        """Get a page of the messages associated with a poll, newest first, as read-only rows."""
         try:
-            # Query the database
-            stmt = select(PollMessage).where(PollMessage.poll_id == poll_id)
+            # Query the database; rows keep attribute access without ORM hydration.
+            # Served by idx_poll_messages_poll_id_id (migration 022)
+            stmt = (
+                select(
+                    PollMessage.id,
+                    PollMessage.poll_id,
+                    PollMessage.channel_id,
+                    PollMessage.message_id,
+                    PollMessage.message_type,
+                    PollMessage.created_at
+                )
+                .where(PollMessage.poll_id == poll_id)
+                .order_by(PollMessage.id.desc())
+                .limit(limit)
+                .offset(offset)
+            )
             result = await self.db.execute(stmt)
-            messages = result.scalars().all()
+            messages = result.all()
             
             return messages
         except Exception as e:
-            self.logger.error(f"Error getting poll messages: {e}", exc_info=True)
+            self.logger.error("Error getting poll messages: %s", e, exc_info=True)
             raise DatabaseError(f"Failed to get poll messages: {str(e)}")
             
-    async def get_all_active_polls(self) -> List[Poll]:
-        """Get all active polls from all guilds."""
+    async def get_all_active_polls(self) -> List[Row]:
+        """Get all active polls from all guilds as rows of ACTIVE_POLL_COLUMNS plus the poll message ids."""
         try:
-            stmt = select(Poll).where(Poll.is_active == True)
+            # Polls come from the partial covering index polls_active_idx (migration 020);
+            # TZDateTime already returns timezone-aware end times
+            stmt = self._active_polls_query()
             result = await self.db.execute(stmt)
-            polls = result.scalars().all()
+            polls = result.all()
             
-            # Ensure all poll end_times have timezone information
-            for poll in polls:
-                if poll.end_time and poll.end_time.tzinfo is None:
-                    poll.end_time = poll.end_time.replace(tzinfo=timezone.utc)
-                
             return polls
         except Exception as e:
-            self.logger.error(f"Error getting all active polls: {e}", exc_info=True)
+            self.logger.error("Error getting all active polls: %s", e, exc_info=True)
             return []
             
     async def get_votes_per_option(self, poll_id: int) -> Dict[int, int]:
@@ -916,26 +1087,25 @@ class PollService:
             DatabaseError: If an error occurs while getting the votes
         """
         try:
-            # Get all votes for this poll
-            stmt = select(Vote).where(Vote.poll_id == poll_id)
+            # Count votes for each option in the database, one row per option
+            selected = func.json_array_elements_text(Vote.option_ids).table_valued("value").lateral()
+            selected_id = cast(selected.c.value, Integer)
+            stmt = (
+                select(selected_id, func.count())
+                .select_from(Vote)
+                .join(selected, true())
+                .where(Vote.poll_id == poll_id)
+                .group_by(selected_id)
+            )
             result = await self.db.execute(stmt)
-            votes = result.scalars().all()
-            
-            # Count votes for each option
-            votes_per_option = {}
-            for vote in votes:
-                for option_id in vote.option_ids:
-                    if option_id in votes_per_option:
-                        votes_per_option[option_id] += 1
-                    else:
-                        votes_per_option[option_id] = 1
+            votes_per_option = {option_id: count for option_id, count in result}
             
             return votes_per_option
         except Exception as e:
-            self.logger.error(f"Error getting votes per option: {e}", exc_info=True)
+            self.logger.error("Error getting votes per option: %s", e, exc_info=True)
             raise DatabaseError(f"Failed to get votes per option: {str(e)}")
 
-    async def get_user_selections(self, poll_id: int, user_id: str) -> List:
+    async def get_user_selections(self, poll_id: int, user_id: str) -> List[RowMapping]:
         """
         Get a user's selections for a poll.
         
@@ -965,24 +1135,11 @@ class PollService:
                 )
             )
             result = await self.db.execute(stmt)
-            selections = result.all()
-            
-            # Convert the result to UserPollSelection-like objects
-            selection_objects = []
-            for row in selections:
-                selection_dict = {
-                    'id': row.id,
-                    'poll_id': row.poll_id,
-                    'user_id': row.user_id,
-                    'selections': row.selections,
-                    'created_at': row.created_at,
-                    'updated_at': row.updated_at
-                }
-                selection_objects.append(selection_dict)
             
-            return selection_objects
+            # Mapping rows already give UserPollSelection-like key access, e.g. row['selections']
+            return result.mappings().all()
         except Exception as e:
-            self.logger.error(f"Error getting user selections: {e}", exc_info=True)
+            self.logger.error("Error getting user selections: %s", e, exc_info=True)
             raise DatabaseError(f"Failed to get user selections: {str(e)}")
             
     async def register_vote(self, poll_id: int, user_id: str, option_indices: List[int]) -> None:
@@ -998,45 +1155,17 @@ class PollService:
             DatabaseError: If an error occurs while registering the vote
         """
         try:
-            # First, remove any existing selections
-            delete_stmt = delete(UserPollSelection).where(
-                and_(
-                    UserPollSelection.poll_id == poll_id,
-                    UserPollSelection.user_id == user_id
-                )
-            )
-            await self.db.execute(delete_stmt)
-            
-            # Now add the new selections using direct SQL to avoid any issues with option_index
-            # Create the current timestamp
-            now = datetime.utcnow()
-            
-            # Convert the Python list to a JSON string for PostgreSQL
-            selections_json = json.dumps(option_indices)
-            
-            # Insert with only the columns that exist in the database
-            query = text("""
-            INSERT INTO user_poll_selections 
-                (poll_id, user_id, selections, created_at, updated_at) 
-            VALUES 
-                (:poll_id, :user_id, :selections, :created_at, :updated_at)
-            """)
-            
             await self.db.execute(
-                query, 
+                _REGISTER_VOTE_STMT,
                 {
                     "poll_id": poll_id,
                     "user_id": user_id,
-                    "selections": selections_json,  # Use the JSON string instead of the Python list
-                    "created_at": now,
-                    "updated_at": now
+                    "selections": [str(idx) for idx in option_indices]
                 }
             )
             
-            await self.db.flush()
-            
         except Exception as e:
-            self.logger.error(f"Error registering vote: {e}", exc_info=True)
+            self.logger.error("Error registering vote: %s", e, exc_info=True)
             raise DatabaseError(f"Failed to register vote: {str(e)}")
 
     async def get_poll_message(self, poll_id: int) -> Optional[Tuple[int, int]]:
@@ -1078,7 +1207,7 @@ class PollService:
                 
             return None
         except Exception as e:
-            self.logger.error(f"Error getting poll message: {e}", exc_info=True)
+            self.logger.error("Error getting poll message: %s", e, exc_info=True)
             return None
 
     # Add new utility method for direct end_time updates
@@ -1098,17 +1227,12 @@ class PollService:
             db_safe_end_time = self._make_db_safe_datetime(end_time)
             
             # Use direct SQL to update the end_time
-            stmt = text(
-                "UPDATE polls SET end_time = :end_time WHERE id = :poll_id"
-            ).bindparams(
-                end_time=db_safe_end_time,
-                poll_id=poll_id
+            await self.db.execute(
+                _UPDATE_POLL_END_TIME_STMT,
+                {"end_time": db_safe_end_time, "poll_id": poll_id}
             )
             
-            await self.db.execute(stmt)
-            await self.db.flush()
-            
-            self.logger.debug(f"Updated poll {poll_id} end_time to {db_safe_end_time}")
+            self.logger.debug("Updated poll %s end_time to %s", poll_id, db_safe_end_time)
         except Exception as e:
-            self.logger.error(f"Error updating poll end time: {e}", exc_info=True)
+            self.logger.error("Error updating poll end time: %s", e, exc_info=True)
             raise DatabaseError(f"Failed to update poll end time: {str(e)}")
\ No newline at end of file
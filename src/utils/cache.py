@@ -0,0 +1,48 @@
+from typing import Any, Callable, Dict, Hashable, Tuple
+import time
+
+class TTLCache:
+    """Small in-process cache whose entries expire a fixed number of seconds after being set.
+
+    Every operation is synchronous, so it is safe to share between coroutines on
+    the bot's event loop without a lock.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 4096):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key for ttl seconds."""
+        if key not in self._entries and len(self._entries) >= self.maxsize:
+            self._evict()
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> None:
+        """Drop every entry whose key matches predicate."""
+        for key in [key for key in self._entries if predicate(key)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def _evict(self) -> None:
+        """Make room for one entry: drop expired entries, else the oldest one."""
+        now = time.monotonic()
+        self.invalidate(lambda key: self._entries[key][0] <= now)
+        if len(self._entries) >= self.maxsize:
+            # Dicts keep insertion order, so the first key is the oldest entry
+            del self._entries[next(iter(self._entries))]
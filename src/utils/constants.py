@@ -1,5 +1,8 @@
 from enum import Enum
 
+# Regional indicator letters 🇦-🇿 used to label poll options, built once at import
+EMOJI_LETTERS = tuple(chr(ord('🇦') + i) for i in range(26))
+
 class ButtonIds:
     OPTION_PREFIX = "poll_option_"
     CLOSE_POLL = "close_poll"
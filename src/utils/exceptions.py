@@ -51,13 +51,17 @@ class GuildError(Exception):
         self.error_code = error_code
         self.message = message
 
+# User-facing message builders keyed by exception class; subclasses resolve through their MRO
+_ERROR_MESSAGES = {
+    PollError: lambda error: f"{error.message} (Error code: {error.error_code})",
+    sa_exc.IntegrityError: lambda error: "A database constraint was violated.",
+    sa_exc.TimeoutError: lambda error: "The database operation timed out. Please try again.",
+}
+
 def handle_poll_error(error: Exception) -> str:
     """Convert errors to user-friendly messages."""
-    if isinstance(error, PollError):
-        return f"{error.message} (Error code: {error.error_code})"
-    elif isinstance(error, sa_exc.IntegrityError):
-        return "A database constraint was violated."
-    elif isinstance(error, sa_exc.TimeoutError):
-        return "The database operation timed out. Please try again."
-    else:
-        return "An unexpected error occurred. Please try again later."
+    for cls in type(error).__mro__:
+        build_message = _ERROR_MESSAGES.get(cls)
+        if build_message is not None:
+            return build_message(error)
+    return "An unexpected error occurred. Please try again later."
@@ -1,49 +1,39 @@
-import os
+import atexit
+import queue
 import logging
-from logging.handlers import RotatingFileHandler
-from src.config.settings import settings
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
-def setup_logging():
-    """Configure logging for the application."""
-    # Create logs directory if it doesn't exist
-    os.makedirs(settings.LOG_DIR, exist_ok=True)
+LOG_FILE = 'discord_bot.log'
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
-    # Create formatters
-    console_formatter = logging.Formatter('%(levelname)s - %(message)s')
-    file_formatter = logging.Formatter(settings.LOG_FORMAT)
+def setup_logging() -> QueueListener:
+    """Configure logging for the application and return the started file log listener."""
+    # The format never shows thread or process details, so skip collecting them for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
 
-    # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(settings.LOG_LEVEL)
-
-    # Console handler (less verbose)
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(settings.CONSOLE_LOG_LEVEL)
-    console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
-
-    # File handlers (more verbose)
-    # Main debug log file
-    debug_handler = RotatingFileHandler(
-        os.path.join(settings.LOG_DIR, 'debug.log'),
-        maxBytes=10*1024*1024,  # 10MB
+    # Rotating log file
+    file_handler = RotatingFileHandler(
+        LOG_FILE,
+        maxBytes=10000000,
         backupCount=5
     )
-    debug_handler.setLevel(settings.FILE_LOG_LEVEL)
-    debug_handler.setFormatter(file_formatter)
-    root_logger.addHandler(debug_handler)
 
-    # Error log file
-    error_handler = RotatingFileHandler(
-        os.path.join(settings.LOG_DIR, 'error.log'),
-        maxBytes=10*1024*1024,  # 10MB
-        backupCount=5
-    )
-    error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(file_formatter)
-    root_logger.addHandler(error_handler)
+    # File handlers run on a listener thread so logging never blocks the event loop on
+    # disk I/O or rotation; records reach it already formatted by the QueueHandler
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
 
-    # Set specific log levels for noisy modules
-    logging.getLogger('discord').setLevel(logging.WARNING)
-    logging.getLogger('sqlalchemy').setLevel(logging.WARNING)
-    logging.getLogger('aiohttp').setLevel(logging.WARNING) 
\ No newline at end of file
+    # Console handler stays synchronous
+    logging.basicConfig(
+        level=logging.INFO,
+        format=LOG_FORMAT,
+        handlers=[
+            QueueHandler(log_queue),
+            logging.StreamHandler()
+        ]
+    )
+    return listener
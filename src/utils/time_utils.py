@@ -1,6 +1,11 @@
 from datetime import timedelta
 import re
 
+# Duration components such as "5d", "12h", "30m" or "45s"
+_DURATION_RE = re.compile(r'(\d+)([dhms])', re.IGNORECASE)
+
+_UNIT_SECONDS = {'d': 86400, 'h': 3600, 'm': 60, 's': 1}
+
 def parse_duration(duration_str: str) -> timedelta:
     """Parse a duration string into a timedelta object.
     
@@ -23,33 +28,14 @@ def parse_duration(duration_str: str) -> timedelta:
     if not duration_str:
         raise ValueError("Duration string cannot be empty")
     
-    # Define regex pattern for duration components
-    pattern = re.compile(r'(\d+)([dhms])', re.IGNORECASE)
-    matches = pattern.findall(duration_str)
+    matches = _DURATION_RE.findall(duration_str)
     
     if not matches:
         raise ValueError(f"Invalid duration format: {duration_str}")
     
-    # Initialize duration components
-    days = hours = minutes = seconds = 0
-    
-    # Process each component
-    for value, unit in matches:
-        value = int(value)
-        unit = unit.lower()
-        
-        if unit == 'd':
-            days = value
-        elif unit == 'h':
-            hours = value
-        elif unit == 'm':
-            minutes = value
-        elif unit == 's':
-            seconds = value
+    # Later components of the same unit replace earlier ones
+    unit_values = {unit.lower(): int(value) for value, unit in matches}
     
     return timedelta(
-        days=days,
-        hours=hours,
-        minutes=minutes,
-        seconds=seconds
-    ) 
\ No newline at end of file
+        seconds=sum(value * _UNIT_SECONDS[unit] for unit, value in unit_values.items())
+    )
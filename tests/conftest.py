@@ -0,0 +1,37 @@
+import asyncio
+import os
+
+import pytest
+
+# Service tests run their SQL against a real Postgres database. Point this at a
+# throwaway database: every test creates the schema and drops it again.
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+# Importing the bot modules loads src.config.settings, which requires these
+os.environ.setdefault("DISCORD_TOKEN", "test-token")
+os.environ.setdefault("DISCORD_APPLICATION_ID", "0")
+os.environ.setdefault("DATABASE_URL", TEST_DATABASE_URL or "postgresql+asyncpg://localhost/polls_test")
+
+
+async def _run_with_session(test_body):
+    from src.database.database import Base, Database
+
+    database = Database(TEST_DATABASE_URL, pool_size=1, max_overflow=0)
+    async with database.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await database.init_db()
+    try:
+        async with database.AsyncSessionLocal() as session:
+            await test_body(session)
+    finally:
+        async with database.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await database.engine.dispose()
+
+
+@pytest.fixture
+def run_with_session():
+    """Run an async test body with a session on a freshly created schema."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    return lambda test_body: asyncio.run(_run_with_session(test_body))
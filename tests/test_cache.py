@@ -0,0 +1,86 @@
+import pytest
+
+from src.utils import cache
+from src.utils.cache import TTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Control the time seen by TTLCache; advance it by adding to clock[0]."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_returns_value_until_ttl_expires(clock):
+    entries = TTLCache(ttl=30)
+    entries.set("key", [1, 2])
+
+    clock[0] += 29.9
+    assert entries.get("key") == [1, 2]
+
+    clock[0] += 0.1
+    assert entries.get("key") is None
+    assert entries.get("key", "missing") == "missing"
+
+
+def test_set_refreshes_expiry(clock):
+    entries = TTLCache(ttl=30)
+    entries.set("key", 1)
+    clock[0] += 20
+    entries.set("key", 2)
+    clock[0] += 20
+
+    assert entries.get("key") == 2
+
+
+def test_full_cache_drops_expired_entries_first(clock):
+    entries = TTLCache(ttl=30, maxsize=2)
+    entries.set("old", 1)
+    clock[0] += 10
+    entries.set("new", 2)
+    clock[0] += 25
+
+    entries.set("third", 3)
+
+    assert entries.get("old") is None
+    assert entries.get("new") == 2
+    assert entries.get("third") == 3
+
+
+def test_full_cache_drops_oldest_entry_when_none_expired(clock):
+    entries = TTLCache(ttl=30, maxsize=2)
+    entries.set("first", 1)
+    entries.set("second", 2)
+
+    entries.set("third", 3)
+
+    assert entries.get("first") is None
+    assert entries.get("second") == 2
+    assert entries.get("third") == 3
+
+
+def test_replacing_a_key_in_a_full_cache_keeps_the_others(clock):
+    entries = TTLCache(ttl=30, maxsize=2)
+    entries.set("first", 1)
+    entries.set("second", 2)
+
+    entries.set("first", 10)
+
+    assert entries.get("first") == 10
+    assert entries.get("second") == 2
+
+
+def test_invalidate_and_clear(clock):
+    entries = TTLCache(ttl=30)
+    entries.set(("leaderboard", 1, "a"), 1)
+    entries.set(("leaderboard", 1, "b"), 2)
+    entries.set(("leaderboard", 2, "a"), 3)
+
+    entries.invalidate(lambda key: key[1] == 1)
+    assert entries.get(("leaderboard", 1, "a")) is None
+    assert entries.get(("leaderboard", 1, "b")) is None
+    assert entries.get(("leaderboard", 2, "a")) == 3
+
+    entries.clear()
+    assert entries.get(("leaderboard", 2, "a")) is None
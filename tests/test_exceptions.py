@@ -0,0 +1,39 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import exc as sa_exc
+
+from src.utils.exceptions import (
+    PollError, StateError, ValidationError, PointsError, GuildError, handle_poll_error
+)
+
+
+def test_poll_error_message_includes_error_code():
+    assert handle_poll_error(PollError("Poll not found", "NOT_FOUND")) == "Poll not found (Error code: NOT_FOUND)"
+
+
+@pytest.mark.parametrize("error, expected", [
+    (StateError("open", "revealed"), "Invalid state transition from open to revealed (Error code: INVALID_STATE_TRANSITION)"),
+    (ValidationError("Too many options", "options"), "Too many options (Error code: VALIDATION_ERROR_OPTIONS)"),
+    (PointsError("Failed to score"), "Failed to score (Error code: POINTS_ERROR)"),
+])
+def test_poll_error_subclasses_use_the_poll_error_message(error, expected):
+    assert handle_poll_error(error) == expected
+
+
+def test_database_errors_resolve_through_their_base_classes():
+    integrity_error = sa_exc.IntegrityError("INSERT ...", {}, Exception("duplicate key"))
+    timeout_error = sa_exc.TimeoutError("QueuePool limit reached")
+
+    assert handle_poll_error(integrity_error) == "A database constraint was violated."
+    assert handle_poll_error(timeout_error) == "The database operation timed out. Please try again."
+
+
+@pytest.mark.parametrize("error", [
+    ValueError("boom"),
+    GuildError("Guild missing", 1),
+    sa_exc.OperationalError("SELECT 1", {}, Exception("connection lost")),
+])
+def test_unmapped_errors_get_the_generic_message(error):
+    assert handle_poll_error(error) == "An unexpected error occurred. Please try again later."
@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("discord")
+
+from src.services.loaders import PollMessageLoader
+
+
+class RecordingLoader(PollMessageLoader):
+    """Loader whose query returns canned messages and records every batch it was asked for."""
+
+    def __init__(self, messages=None, fail_batches=()):
+        super().__init__(session=None)
+        self.messages = messages or {}
+        self.fail_batches = set(fail_batches)
+        self.batches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.release = None
+
+    async def _fetch_latest(self, poll_ids):
+        batch_number = len(self.batches)
+        self.batches.append(sorted(poll_ids))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.release is not None:
+                await self.release.wait()
+            else:
+                await asyncio.sleep(0)
+            if batch_number in self.fail_batches:
+                raise RuntimeError("query failed")
+            return {poll_id: self.messages[poll_id] for poll_id in poll_ids if poll_id in self.messages}
+        finally:
+            self.in_flight -= 1
+
+
+def test_concurrent_loads_share_one_query():
+    async def run():
+        loader = RecordingLoader({1: "message 1", 3: "message 3"})
+        results = await asyncio.gather(loader.load(1), loader.load(2), loader.load(3), loader.load(1))
+        return loader, results
+
+    loader, results = asyncio.run(run())
+
+    assert results == ["message 1", None, "message 3", "message 1"]
+    assert loader.batches == [[1, 2, 3]]
+
+
+def test_loads_queued_during_a_query_join_the_next_batch():
+    async def run():
+        loader = RecordingLoader({1: "message 1", 2: "message 2"})
+        loader.release = asyncio.Event()
+        first = asyncio.ensure_future(loader.load(1))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # The first query is in flight; this lookup has to wait for it
+        second = asyncio.ensure_future(loader.load(2))
+        await asyncio.sleep(0)
+        loader.release.set()
+        return loader, await asyncio.gather(first, second)
+
+    loader, results = asyncio.run(run())
+
+    assert results == ["message 1", "message 2"]
+    assert loader.batches == [[1], [2]]
+    assert loader.max_in_flight == 1
+
+
+def test_failed_query_only_fails_its_own_batch():
+    async def run():
+        loader = RecordingLoader({2: "message 2"}, fail_batches={0})
+        loader.release = asyncio.Event()
+        first = asyncio.ensure_future(loader.load(1))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(loader.load(2))
+        await asyncio.sleep(0)
+        loader.release.set()
+        return loader, await asyncio.gather(first, second, return_exceptions=True)
+
+    loader, (first, second) = asyncio.run(run())
+
+    assert isinstance(first, RuntimeError)
+    assert second == "message 2"
+    assert loader.batches == [[1], [2]]
+
+
+def test_cancelling_the_dispatch_cancels_every_pending_load():
+    async def run():
+        loader = RecordingLoader()
+        loader.release = asyncio.Event()
+        first = asyncio.ensure_future(loader.load(1))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(loader.load(2))
+        await asyncio.sleep(0)
+
+        loader._dispatch_task.cancel()
+        results = await asyncio.gather(first, second, return_exceptions=True)
+        return loader, results
+
+    loader, results = asyncio.run(run())
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert loader.batches == [[1]]
+    assert loader._pending == {}
@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("discord")
+
+from src.database.models import Poll, UserPollSelection, Vote, _normalize_option_list
+
+
+@pytest.mark.parametrize("value, expected", [
+    ([0, 2], ["0", "2"]),
+    (["1", 3], ["1", "3"]),
+    ((4, 5), ["4", "5"]),
+    ([], []),
+    (None, None),
+])
+def test_normalize_option_list(value, expected):
+    assert _normalize_option_list(value) == expected
+
+
+def test_option_lists_are_stored_as_strings():
+    poll = Poll(correct_answers=[0, 1])
+    vote = Vote(option_ids=[2])
+    selection = UserPollSelection(selections=[1, "3"])
+
+    assert poll.correct_answers == ["0", "1"]
+    assert vote.option_ids == ["2"]
+    assert selection.selections == ["1", "3"]
+
+
+def test_option_lists_are_normalized_on_assignment():
+    poll = Poll()
+    poll.correct_answers = (2,)
+    assert poll.correct_answers == ["2"]
+
+    poll.correct_answers = None
+    assert poll.correct_answers is None
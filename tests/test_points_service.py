@@ -0,0 +1,92 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("asyncpg")
+pytest.importorskip("discord")
+
+from datetime import datetime, timedelta, timezone
+
+from src.database.models import Guild, Poll, UserPollSelection, Vote
+from src.services.points_service import PointsService
+from src.utils.exceptions import PointsError
+
+GUILD_ID = 1
+POLL_TYPE = "test"
+
+
+def _revealed_poll(poll_id, correct_answers):
+    return Poll(
+        id=poll_id,
+        poll_type=POLL_TYPE,
+        question="Question?",
+        creator_id=42,
+        guild_id=GUILD_ID,
+        end_time=datetime.now(timezone.utc) - timedelta(days=1),
+        is_active=False,
+        is_revealed=True,
+        correct_answers=correct_answers
+    )
+
+
+async def _leaderboard(session):
+    service = PointsService(session)
+    await service.update_guild_leaderboard(GUILD_ID, POLL_TYPE)
+    await session.commit()
+    entries = await service.get_poll_type_leaderboard(GUILD_ID, POLL_TYPE)
+    return [(entry.user_id, entry.points, entry.total_correct, entry.rank) for entry in entries]
+
+
+def test_update_guild_leaderboard_ranks_revealed_polls(run_with_session):
+    async def body(session):
+        session.add(Guild(guild_id=GUILD_ID, name="Test guild"))
+        await session.flush()
+        session.add_all([_revealed_poll(1, [0, 1]), _revealed_poll(2, [2])])
+        await session.flush()
+        session.add_all([
+            # Poll 1 has votes, so its leftover selections are ignored
+            Vote(poll_id=1, user_id="a", option_ids=[0, 1]),
+            Vote(poll_id=1, user_id="b", option_ids=[1]),
+            Vote(poll_id=1, user_id="c", option_ids=[2]),
+            UserPollSelection(poll_id=1, user_id="d", selections=[0]),
+            # Poll 2 has only selections, which count in place of votes
+            UserPollSelection(poll_id=2, user_id="b", selections=[2]),
+            UserPollSelection(poll_id=2, user_id="c", selections=[0]),
+        ])
+        await session.commit()
+
+        # Ties on points are broken by the number of polls answered correctly
+        assert await _leaderboard(session) == [
+            ("b", 2, 2, 1),
+            ("a", 2, 1, 2),
+            ("c", 0, 0, 3),
+        ]
+
+        # A rebuild replaces the previous rows instead of adding to them
+        assert await _leaderboard(session) == [
+            ("b", 2, 2, 1),
+            ("a", 2, 1, 2),
+            ("c", 0, 0, 3),
+        ]
+
+    run_with_session(body)
+
+
+class FailingLeaderboardPointsService(PointsService):
+    async def update_poll_type_leaderboard(self, guild_id, poll_type, user_points):
+        raise RuntimeError("leaderboard unavailable")
+
+
+def test_calculate_poll_points_raises_when_the_leaderboard_update_fails(run_with_session):
+    async def body(session):
+        session.add(Guild(guild_id=GUILD_ID, name="Test guild"))
+        await session.flush()
+        session.add(_revealed_poll(1, [0]))
+        await session.flush()
+        session.add(Vote(poll_id=1, user_id="a", option_ids=[0]))
+        await session.commit()
+
+        # The reveal must roll back rather than commit without the points
+        with pytest.raises(PointsError):
+            await FailingLeaderboardPointsService(session).calculate_poll_points(1)
+
+    run_with_session(body)
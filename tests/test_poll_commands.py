@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("discord")
+
+from src.bot.cogs.poll_commands import PollCommands
+
+POLL = {
+    'id': 1,
+    'question': "Question?",
+    'correct_answers': ["1"],
+    'options': {"0": "Red", "1": "Blue"},
+}
+
+
+def _format(points_updates, leaderboard=()):
+    # The formatter only reads self.bot, and only when it exists
+    return PollCommands._format_results_message_with_dict(
+        SimpleNamespace(), POLL, points_updates, list(leaderboard)
+    )
+
+
+def test_results_message_groups_participants_by_points():
+    message = _format([
+        {"user_id": "a", "poll_points": 1},
+        {"user_id": "b", "poll_points": 0},
+        {"user_id": "c", "poll_points": 1},
+        {"user_id": "d", "poll_points": 2},
+    ])
+
+    assert "Correct answers: 🇧 Blue" in message
+    assert "Total participants: 4" in message
+    assert (
+        "Points distribution:\n"
+        "• 1 person scored 2 points\n"
+        "• 2 people scored 1 point\n"
+        "• 1 person scored 0 points\n"
+    ) in message
+
+
+def test_results_message_counts_missing_points_as_zero():
+    message = _format([{"user_id": "a"}, {"user_id": "b", "poll_points": 0}])
+
+    assert "• 2 people scored 0 points\n" in message
+
+
+def test_results_message_lists_the_leaderboard():
+    message = _format(
+        [{"user_id": "a", "poll_points": 1}],
+        [{"user_id": "a", "username": "Alice", "points": 3, "rank": 1}],
+    )
+
+    assert "**Leaderboard**\n🥇 **Alice**: 3 points\n" in message
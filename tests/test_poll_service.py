@@ -0,0 +1,143 @@
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("asyncpg")
+pytest.importorskip("discord")
+
+from sqlalchemy import update
+
+from src.database.models import Guild, Poll, Vote
+from src.services.poll_service import PollService
+from src.utils.exceptions import PollError
+
+GUILD_ID = 1
+
+
+async def _create_poll(session, options, max_selections=1):
+    session.add(Guild(guild_id=GUILD_ID, name="Test guild"))
+    await session.flush()
+    service = PollService(session)
+    poll = await service.create_poll(
+        question="Question?",
+        options=options,
+        creator_id="42",
+        guild_id=GUILD_ID,
+        poll_type="test",
+        max_selections=max_selections
+    )
+    await session.commit()
+    return service, poll
+
+
+def test_poll_results_count_votes_by_option_index(run_with_session):
+    async def body(session):
+        # Option texts that look like indices must not be counted for another option
+        service, poll = await _create_poll(session, ["1", "2", "3"], max_selections=2)
+        session.add_all([
+            Vote(poll_id=poll.id, user_id="a", option_ids=[1]),
+            Vote(poll_id=poll.id, user_id="b", option_ids=[1, 2]),
+        ])
+        await session.commit()
+
+        results = await service.get_poll_results(poll.id)
+
+        assert results["total_votes"] == 2
+        assert results["vote_counts"] == {"0": 0, "1": 2, "2": 1}
+        assert [option["text"] for option in results["options"]] == ["2", "3", "1"]
+        assert [option["is_winner"] for option in results["options"]] == [True, False, False]
+        assert results["correct_answers"] is None
+
+    run_with_session(body)
+
+
+def test_poll_results_use_selections_until_votes_exist(run_with_session):
+    async def body(session):
+        service, poll = await _create_poll(session, ["Red", "Blue"])
+        await service.add_selection(poll.id, "a", "1")
+
+        results = await service.get_poll_results(poll.id)
+        assert results["total_votes"] == 1
+        assert results["vote_counts"] == {"0": 0, "1": 1}
+
+        # Once votes are recorded the selections no longer count
+        session.add(Vote(poll_id=poll.id, user_id="b", option_ids=[0]))
+        await session.commit()
+
+        results = await service.get_poll_results(poll.id)
+        assert results["total_votes"] == 1
+        assert results["vote_counts"] == {"0": 1, "1": 0}
+
+    run_with_session(body)
+
+
+def test_poll_results_for_missing_poll(run_with_session):
+    async def body(session):
+        with pytest.raises(PollError):
+            await PollService(session).get_poll_results(12345)
+
+    run_with_session(body)
+
+
+def test_add_selection_toggles_and_evicts_oldest(run_with_session):
+    async def body(session):
+        service, poll = await _create_poll(session, ["A", "B", "C"], max_selections=2)
+
+        selection = await service.add_selection(poll.id, "a", "0")
+        assert selection.selections == ["0"]
+        selection = await service.add_selection(poll.id, "a", "1")
+        assert selection.selections == ["0", "1"]
+
+        # At max_selections the oldest choice makes room for the new one
+        selection = await service.add_selection(poll.id, "a", "2")
+        assert selection.selections == ["1", "2"]
+
+        # Selecting a chosen option again removes it
+        selection = await service.add_selection(poll.id, "a", "1")
+        assert selection.selections == ["2"]
+
+    run_with_session(body)
+
+
+def test_add_selection_rejects_closed_poll(run_with_session):
+    async def body(session):
+        service, poll = await _create_poll(session, ["A", "B"])
+        await session.execute(update(Poll).where(Poll.id == poll.id).values(is_active=False))
+        await session.commit()
+
+        with pytest.raises(PollError, match="Poll is not active"):
+            await service.add_selection(poll.id, "a", "0")
+
+        with pytest.raises(PollError, match="Poll not found"):
+            await service.add_selection(poll.id + 1, "a", "0")
+
+    run_with_session(body)
+
+
+def test_get_votes_per_option(run_with_session):
+    async def body(session):
+        service, poll = await _create_poll(session, ["A", "B", "C"], max_selections=2)
+        session.add_all([
+            Vote(poll_id=poll.id, user_id="a", option_ids=[0, 1]),
+            Vote(poll_id=poll.id, user_id="b", option_ids=[1]),
+        ])
+        await session.commit()
+
+        assert await service.get_votes_per_option(poll.id) == {0: 1, 1: 2}
+
+    run_with_session(body)
+
+
+def test_get_poll_messages_pages_newest_first(run_with_session):
+    async def body(session):
+        service, poll = await _create_poll(session, ["A", "B"])
+        for message_id in (101, 102, 103):
+            await service.register_poll_message(poll.id, channel_id=7, message_id=message_id)
+        await session.commit()
+
+        first_page = await service.get_poll_messages(poll.id, limit=2)
+        assert [message.message_id for message in first_page] == [103, 102]
+
+        second_page = await service.get_poll_messages(poll.id, limit=2, offset=2)
+        assert [message.message_id for message in second_page] == [101]
+
+    run_with_session(body)
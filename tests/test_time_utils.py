@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+import pytest
+
+from src.utils.time_utils import parse_duration
+
+
+@pytest.mark.parametrize("duration, expected", [
+    ("5d", timedelta(days=5)),
+    ("12h", timedelta(hours=12)),
+    ("30m", timedelta(minutes=30)),
+    ("45s", timedelta(seconds=45)),
+    ("1d12h30m", timedelta(days=1, hours=12, minutes=30)),
+    ("2H15M", timedelta(hours=2, minutes=15)),
+    ("1d 6h", timedelta(days=1, hours=6)),
+])
+def test_parse_duration(duration, expected):
+    assert parse_duration(duration) == expected
+
+
+def test_parse_duration_later_component_of_a_unit_wins():
+    assert parse_duration("1h2h") == timedelta(hours=2)
+
+
+@pytest.mark.parametrize("duration", ["", None, "abc", "5w", "d"])
+def test_parse_duration_rejects_invalid_input(duration):
+    with pytest.raises(ValueError):
+        parse_duration(duration)